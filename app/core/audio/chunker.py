@@ -1,13 +1,21 @@
 # -*- coding: utf-8 -*-
-"""Silence-based audio chunking (no overlap) using pydub."""
+"""Silence-based audio chunking (no overlap) using NumPy or pydub silence detection."""
 from __future__ import annotations
+from bisect import bisect_left, bisect_right
+import math
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 
-from pydub import AudioSegment
+import numpy as np
 from pydub.silence import detect_silence
 
+from app.core.audio.pcm import DecodedAudio, decode_audio, samples_to_segment
+from app.core.audio.silence import detect_silence_np
+
+# Whisper encodes audio in fixed 30 s mel windows; longer input needs another window
+WHISPER_WINDOW_S = 30.0
+
 
 @dataclass
 class ChunkConfig:
@@ -18,14 +26,48 @@ class ChunkConfig:
     max_chunk_s: float = 40.0
     min_silence_len_ms: int = 300
     silence_thresh_dbfs: int = -35  # relative to segment.dBFS; adjust if needed
+    # "numpy" (vectorized, same regions) or "pydub" (reference implementation)
+    silence_detector: str = "numpy"
+    # Non-speech spans at least this long (s) are cut out before inference; 0 disables
+    prune_silence_s: float = 3.0
+    prune_pad_ms: int = 200  # audio kept on each side of a pruned span
+    # Cut as close to (but never beyond) Whisper's 30 s window as silences allow,
+    # so no chunk needs a second, mostly padded window; overrides target/max length
+    align_to_window: bool = False
+
+
+def whisper_windows(duration_s: float) -> int:
+    """Number of 30 s encoder windows Whisper runs for `duration_s` of input."""
+    return max(1, math.ceil(duration_s / WHISPER_WINDOW_S - 1e-9))
 
 # app/core/audio/chunker.py
 
+class SilenceIndex:
+    """Silence regions kept as sorted start/end arrays for O(log n) window queries.
+
+    Detector output is sorted and non-overlapping, so both `starts` and `ends`
+    are ascending and the regions touching a window form one contiguous run.
+    """
+
+    def __init__(self, silences: List[Tuple[int, int]]) -> None:
+        self.starts = [int(s) for s, _ in silences]
+        self.ends = [int(e) for _, e in silences]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def window(self, window_start: int, window_end: int) -> List[Tuple[int, int]]:
+        """Regions with end > window_start and start < window_end, in file order."""
+        lo = bisect_right(self.ends, window_start)
+        hi = bisect_left(self.starts, window_end, lo)
+        return list(zip(self.starts[lo:hi], self.ends[lo:hi]))
+
+
 def _nearest_silence_boundary(
     ms: int,
     window_start: int,
     window_end: int,
-    silences: List[Tuple[int, int]]
+    silences: SilenceIndex
 ) -> Optional[int]:
     """
     Pick a cut position (in ms) *inside the intersection* of [window_start, window_end]
@@ -33,7 +75,7 @@ def _nearest_silence_boundary(
     the one nearest to target `ms`. Returns None if no silence intersects the window.
     """
     candidates: List[int] = []
-    for s, e in silences:
+    for s, e in silences.window(window_start, window_end):
         # Intersection of the silence region and the window
         a = max(s, window_start)
         b = min(e, window_end)
@@ -47,11 +89,69 @@ def _nearest_silence_boundary(
     return min(candidates, key=lambda x: abs(x - ms))
 
 
+def _detect_silence(samples: np.ndarray, sample_rate: int, cfg: ChunkConfig) -> List[List[int]]:
+    """Silent [start_ms, end_ms] regions of `samples` using the configured detector."""
+    if cfg.silence_detector == "pydub":
+        return detect_silence(
+            samples_to_segment(samples, sample_rate),
+            min_silence_len=cfg.min_silence_len_ms,
+            silence_thresh=cfg.silence_thresh_dbfs,
+        )
+    return detect_silence_np(
+        samples, sample_rate,
+        min_silence_len=cfg.min_silence_len_ms,
+        silence_thresh=cfg.silence_thresh_dbfs,
+    )
+
+
+def _samples_to_ms(n: int, sample_rate: int) -> int:
+    """Length in ms the way pydub reports it (`len(AudioSegment)`)."""
+    return int(round(1000 * (n / float(sample_rate))))
+
+
+def _chunk_limits(cfg: ChunkConfig) -> Tuple[int, int, int, int]:
+    """Return (target_ms, min_ms, max_ms, win_ms) for the configured chunking mode."""
+    target_ms = int(cfg.target_s * 1000)
+    min_ms = int(cfg.min_chunk_s * 1000)
+    max_ms = int(cfg.max_chunk_s * 1000)
+    win_ms = int(cfg.search_window_s * 1000)
+    if cfg.align_to_window:
+        # aim at the window end itself: the chosen cut is the silence midpoint
+        # closest to 30 s, and the hard-cut fallback lands exactly on it
+        max_ms = min(max_ms, int(WHISPER_WINDOW_S * 1000))
+        target_ms = max_ms
+        min_ms = min(min_ms, max_ms)
+    return target_ms, min_ms, max_ms, win_ms
+
+
+def _search_window(pos: int, total_ms: int, cfg: ChunkConfig) -> Tuple[int, int, int]:
+    """Return (target, win_start, win_end) in ms for the chunk starting at `pos`."""
+    target_ms, min_ms, max_ms, win_ms = _chunk_limits(cfg)
+    target = pos + target_ms
+
+    # Clamp the search window; guarantee win_start < win_end
+    win_start = max(pos + min_ms, target - win_ms)
+    win_end = min(total_ms, min(pos + max_ms, target + win_ms))
+    if win_end <= win_start:
+        win_end = min(total_ms, win_start + 1)
+    return target, win_start, win_end
+
+
+def _next_cut(pos: int, total_ms: int, cfg: ChunkConfig, silences: SilenceIndex) -> int:
+    """End (ms) of the chunk starting at `pos`: a silence midpoint near target, else a hard cut."""
+    target, win_start, win_end = _search_window(pos, total_ms, cfg)
+    cut_ms = _nearest_silence_boundary(target, win_start, win_end, silences)
+    if cut_ms is None:
+        # No silence in window ⇒ hard cut (bounded by max length)
+        cut_ms = min(pos + _chunk_limits(cfg)[2], total_ms)
+    return max(cut_ms, pos + 1)  # still keep a tiny guard
+
 
 def compute_boundaries(
     audio_path: Path,
     cfg: ChunkConfig,
-    progress_callback: Optional[callable] = None
+    progress_callback: Optional[callable] = None,
+    audio: Optional[DecodedAudio] = None,
 ) -> List[Tuple[float, float]]:
     """Compute non-overlapping [start_s, end_s) chunks based on silence; fall back to hard cuts.
 
@@ -59,52 +159,80 @@ def compute_boundaries(
         audio_path: Path to audio file
         cfg: Chunking configuration
         progress_callback: Optional callback function(message: str) for progress updates
+        audio: Already-decoded 16 kHz PCM of `audio_path`. Pass it to avoid decoding
+            the file a second time when the caller also needs the samples.
 
     Returns:
         List of (start_seconds, end_seconds) tuples covering the entire audio.
     """
-    if progress_callback:
-        progress_callback("Loading audio file for analysis...")
+    if audio is None:
+        if progress_callback:
+            progress_callback("Loading audio file for analysis...")
+        audio = decode_audio(audio_path)
 
-    seg = AudioSegment.from_file(str(audio_path))
-    total_ms = len(seg)
+    total_ms = _samples_to_ms(audio.num_samples, audio.sample_rate)
     total_duration = total_ms / 1000.0
 
     if progress_callback:
         progress_callback(f"Analyzing audio ({total_duration:.1f}s) for silence detection...")
 
-    bounds: List[Tuple[int, int]] = []
-
-    pos = 0
-    # Precompute silence regions across whole file for simplicity
-    silences = detect_silence(
-        seg, min_silence_len=cfg.min_silence_len_ms,
-        silence_thresh=cfg.silence_thresh_dbfs
-    )  # list of [start_ms, end_ms]
+    # Precompute silence regions across whole file, indexed for window lookups
+    silences = SilenceIndex(_detect_silence(audio.samples, audio.sample_rate, cfg))
 
     if progress_callback:
         progress_callback(f"Found {len(silences)} silence regions, computing chunk boundaries...")
 
+    # Convert to seconds
+    return [(s / 1000.0, e / 1000.0) for (s, e) in boundaries_from_silences(total_ms, cfg, silences)]
+
+
+def boundaries_from_silences(total_ms: int, cfg: ChunkConfig, silences: SilenceIndex) -> List[Tuple[int, int]]:
+    """Cut [0, total_ms) into (start_ms, end_ms) chunks given precomputed silences."""
+    bounds: List[Tuple[int, int]] = []
+    pos = 0
     while pos < total_ms:
-        target = pos + int(cfg.target_s * 1000)
-        min_ms = int(cfg.min_chunk_s * 1000)
-        max_ms = int(cfg.max_chunk_s * 1000)
-        win_ms = int(cfg.search_window_s * 1000)
-
-        # Clamp the search window; guarantee win_start < win_end
-        win_start = max(pos + min_ms, target - win_ms)
-        win_end = min(total_ms, min(pos + max_ms, target + win_ms))
-        if win_end <= win_start:
-            win_end = min(total_ms, win_start + 1)
-
-        cut_ms = _nearest_silence_boundary(target, win_start, win_end, silences)
-        if cut_ms is None:
-            # No silence in window ⇒ hard cut (bounded by max length)
-            cut_ms = min(pos + max_ms, total_ms)
-
-        end_ms = max(cut_ms, pos + 1)  # still keep a tiny guard
+        end_ms = _next_cut(pos, total_ms, cfg, silences)
         bounds.append((pos, end_ms))
         pos = end_ms
+    return bounds
 
-    # Convert to seconds
-    return [(s / 1000.0, e / 1000.0) for (s, e) in bounds]
+
+def iter_boundaries(source, cfg: ChunkConfig, start_ms: int = 0) -> Iterator[Tuple[float, float]]:
+    """Yield the same [start_s, end_s) chunks as `compute_boundaries`, incrementally.
+
+    `source` is a `PcmStream` (or `DecodedAudio`). Each cut only needs audio up to
+    `pos + max_chunk_s` plus one silence length of context, so silence detection
+    runs on that local window and the caller can start transcribing (and release
+    consumed samples) long before the whole file has been decoded.
+
+    A silence region that intersects the search window [a, b] is fully determined
+    by the audio in [a - min_silence_len, b + min_silence_len], which is why the
+    local analysis produces exactly the cut points of the whole-file analysis.
+
+    `start_ms` continues from a previously computed cut; the source must hold audio
+    from `start_ms - min_silence_len_ms` on.
+    """
+    sr = source.sample_rate
+    sil_ms = int(cfg.min_silence_len_ms)
+    max_ms = _chunk_limits(cfg)[2]
+
+    pos = int(start_ms)
+    while True:
+        need_ms = pos + max_ms + sil_ms
+        avail = source.available(-(-need_ms * sr // 1000))  # ceil to samples
+        avail_ms = _samples_to_ms(avail, sr)
+        if source.finished and pos >= avail_ms:
+            return
+
+        # Only the window intersections matter, so analyse just around them.
+        _, win_start, win_end = _search_window(pos, avail_ms, cfg)
+        a_ms = max(0, win_start - sil_ms)
+        b_ms = min(avail_ms, win_end + sil_ms)
+        regions: List[Tuple[int, int]] = []
+        if b_ms > a_ms:
+            window = source.read(a_ms * sr // 1000, b_ms * sr // 1000)
+            regions = [(s + a_ms, e + a_ms) for s, e in _detect_silence(window, sr, cfg)]
+
+        end_ms = _next_cut(pos, avail_ms, cfg, SilenceIndex(regions))
+        yield (pos / 1000.0, end_ms / 1000.0)
+        pos = end_ms
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Content fingerprint of media files, so per-file caches survive renames, moves and copies.
+
+Hashing a multi-GB recording would cost more than some of the work it keys,
+so the fingerprint covers the size plus one block each at the head, middle
+and tail of the file (small files are hashed whole). The fingerprint of an
+unchanged path is remembered in a registry next to the caches, keyed by
+resolved path with its size + mtime as the pre-check, so the blocks are only
+read again after the file changed or moved.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict
+import hashlib
+import json
+import os
+import threading
+
+import logging
+log = logging.getLogger(__name__)
+
+FINGERPRINT_VERSION = 1
+BLOCK_SIZE = 1 << 20          # bytes read at each sample point
+MAX_REGISTRY_ENTRIES = 4096   # oldest paths are dropped beyond this
+
+_REGISTRY_LOCK = threading.Lock()
+
+
+def content_fingerprint(path: Path, block_size: int = BLOCK_SIZE) -> str:
+    """sha1 over the file size and its head, middle and tail blocks (the whole file when small)."""
+    size = path.stat().st_size
+    h = hashlib.sha1(f"v{FINGERPRINT_VERSION}|{size}|".encode("ascii"))
+    with open(path, "rb") as fh:
+        if size <= 3 * block_size:
+            h.update(fh.read())
+        else:
+            for offset in (0, (size - block_size) // 2, size - block_size):
+                fh.seek(offset)
+                h.update(fh.read(block_size))
+    return h.hexdigest()
+
+
+def _read_registry(registry: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(registry.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def file_fingerprint(path: Path, registry: Path) -> str:
+    """Content fingerprint of `path`, reused from `registry` while its path, size and mtime are unchanged."""
+    st = path.stat()
+    key = str(path.resolve())
+    with _REGISTRY_LOCK:
+        rec = _read_registry(registry).get(key)
+    if rec and rec.get("version") == FINGERPRINT_VERSION and rec.get("size") == st.st_size \
+            and rec.get("mtime_ns") == st.st_mtime_ns:
+        return str(rec["fingerprint"])
+
+    fingerprint = content_fingerprint(path)
+    try:
+        with _REGISTRY_LOCK:
+            data = _read_registry(registry)
+            data.pop(key, None)
+            data[key] = {"version": FINGERPRINT_VERSION, "fingerprint": fingerprint,
+                         "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            for old in list(data)[:max(0, len(data) - MAX_REGISTRY_ENTRIES)]:
+                del data[old]
+            registry.parent.mkdir(parents=True, exist_ok=True)
+            tmp = registry.with_name(registry.name + ".tmp")
+            tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            os.replace(tmp, registry)
+    except Exception as e:
+        log.debug(f"Failed to record fingerprint of {path}: {e}")
+    return fingerprint
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""Decode audio once to 16 kHz mono PCM and share it across pipeline stages."""
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+
+import logging
+log = logging.getLogger(__name__)
+
+# Whisper consumes 16 kHz mono float32; chunking analyses the same signal.
+SAMPLE_RATE = 16000
+
+
+class AudioDecodeError(RuntimeError):
+    """Raised when ffmpeg is missing or fails to decode the input."""
+
+
+# Cache ffmpeg executable path (same reasoning as ffprobe: PATH lookup is slow when frozen)
+_FFMPEG_PATH_CACHE = None
+
+def _get_ffmpeg_path() -> str:
+    """Get ffmpeg executable path, with caching to avoid slow PATH lookup."""
+    global _FFMPEG_PATH_CACHE
+
+    if _FFMPEG_PATH_CACHE is not None:
+        return _FFMPEG_PATH_CACHE
+
+    ffmpeg_path = shutil.which("ffmpeg")
+    if ffmpeg_path:
+        _FFMPEG_PATH_CACHE = ffmpeg_path
+        log.info(f"Found ffmpeg at: {ffmpeg_path}")
+        return ffmpeg_path
+
+    # Fallback to just "ffmpeg" if not found (will fail with better error)
+    _FFMPEG_PATH_CACHE = "ffmpeg"
+    return "ffmpeg"
+
+
+def _ffmpeg_cmd(input_path: Path, start_s: float = 0.0) -> list[str]:
+    """ffmpeg command line that writes 16 kHz mono s16le PCM to stdout."""
+    seek = ["-ss", f"{start_s:.3f}"] if start_s > 0 else []
+    return [
+        _get_ffmpeg_path(),
+        "-nostdin",
+        "-threads", "0",
+        *seek,
+        "-i", str(input_path),
+        "-f", "s16le",
+        "-ac", "1",
+        "-acodec", "pcm_s16le",
+        "-ar", str(SAMPLE_RATE),
+        "-",
+    ]
+
+
+def samples_to_segment(samples: np.ndarray, sample_rate: int = SAMPLE_RATE):
+    """Wrap float32 samples as a 16-bit pydub AudioSegment for silence analysis."""
+    from pydub import AudioSegment
+
+    pcm16 = np.clip(np.asarray(samples) * 32768.0, -32768, 32767).astype(np.int16)
+    return AudioSegment(
+        data=pcm16.tobytes(),
+        sample_width=2,
+        frame_rate=sample_rate,
+        channels=1,
+    )
+
+
+@dataclass
+class DecodedAudio:
+    """Mono float32 samples in [-1, 1] at `sample_rate` Hz.
+
+    A single instance is shared by silence analysis (chunker) and Whisper
+    inference so that each job decodes the source file exactly once.
+
+    Also implements the incremental source interface of `PcmStream`
+    (`available` / `read` / `release`), so the chunker can treat a fully
+    decoded (or memory-mapped) file and a live ffmpeg stream alike.
+    """
+    samples: np.ndarray
+    sample_rate: int = SAMPLE_RATE
+
+    @property
+    def num_samples(self) -> int:
+        return int(self.samples.shape[-1])
+
+    @property
+    def duration_s(self) -> float:
+        return self.num_samples / float(self.sample_rate)
+
+    def slice(self, start_s: float, end_s: float) -> np.ndarray:
+        """Return samples in [start_s, end_s) as a view (no copy)."""
+        s_idx = int(start_s * self.sample_rate)
+        e_idx = int(end_s * self.sample_rate)
+        return self.samples[s_idx:e_idx]
+
+    # --- incremental source interface ---
+    finished = True
+
+    def available(self, upto: int) -> int:
+        return self.num_samples
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        return self.samples[start:end]
+
+    def release(self, upto: int) -> None:
+        pass
+
+
+def decode_audio(input_path: Path) -> DecodedAudio:
+    """Decode any ffmpeg-readable file to 16 kHz mono float32.
+
+    Raises:
+        AudioDecodeError: if ffmpeg is missing or returns non-zero.
+    """
+    cmd = _ffmpeg_cmd(Path(input_path))
+    try:
+        res = subprocess.run(cmd, capture_output=True, check=True)
+    except FileNotFoundError:
+        raise AudioDecodeError("ffmpeg not found. Please install FFmpeg and add it to PATH.")
+    except subprocess.CalledProcessError as e:
+        raise AudioDecodeError(f"Failed to load audio: {e.stderr.decode(errors='ignore').strip()}")
+
+    samples = np.frombuffer(res.stdout, np.int16).astype(np.float32) / 32768.0
+    return DecodedAudio(samples=samples, sample_rate=SAMPLE_RATE)
+
+
+class PcmStream:
+    """Decode a file incrementally through an ffmpeg pipe.
+
+    Only a rolling window of samples is kept in memory: callers ask for data up
+    to some sample index with `available()`, slice it with `read()`, and drop
+    everything they no longer need with `release()`. Memory therefore stays
+    bounded by the look-ahead the chunker needs, regardless of file length.
+
+    If `sink` is given (e.g. a PCM cache writer), every decoded block is also
+    handed to `sink.write()`; `sink.commit()` runs when ffmpeg finishes cleanly
+    and `sink.abort()` when the stream is closed early or fails.
+
+    `start_s` seeks before decoding (resume); sample indices stay absolute, so
+    everything before the seek point simply counts as already released.
+    """
+
+    def __init__(self, input_path: Path, block_s: float = 5.0, sink=None, start_s: float = 0.0) -> None:
+        self.input_path = Path(input_path)
+        self.sample_rate = SAMPLE_RATE
+        self._block_bytes = int(block_s * SAMPLE_RATE) * 2
+        self._sink = sink
+        self._buf = np.zeros(0, dtype=np.float32)
+        start = int(round(start_s * SAMPLE_RATE))
+        self._buf_start = start      # absolute sample index of _buf[0]
+        self._decoded = start        # absolute end index of decoded samples
+        self._release_to = start     # samples before this index are not kept
+        self.finished = False
+
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self._proc = subprocess.Popen(
+                _ffmpeg_cmd(self.input_path, start / SAMPLE_RATE),
+                stdout=subprocess.PIPE,
+                stderr=self._stderr,
+            )
+        except FileNotFoundError:
+            self._stderr.close()
+            raise AudioDecodeError("ffmpeg not found. Please install FFmpeg and add it to PATH.")
+
+    def __enter__(self) -> "PcmStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def num_samples(self) -> int:
+        """End of the decoded samples (the full length once `finished`)."""
+        return self._decoded
+
+    @property
+    def duration_s(self) -> float:
+        return self._decoded / float(self.sample_rate)
+
+    def _read_block(self) -> bool:
+        """Decode one more block; return False at end of stream."""
+        data = self._proc.stdout.read(self._block_bytes)
+        if len(data) % 2:
+            data += self._proc.stdout.read(1)
+        if not data:
+            self._finish()
+            return False
+        block = np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+        if self._sink is not None:
+            try:
+                self._sink.write(block)
+            except Exception as e:
+                log.debug(f"PCM sink write failed, dropping sink: {e}")
+                self._drop_sink()
+        self._buf = np.concatenate([self._buf, block]) if self._buf.size else block
+        self._decoded += block.size
+        self._trim()
+        return True
+
+    def _trim(self) -> None:
+        drop = min(self._release_to, self._decoded) - self._buf_start
+        if drop > 0:
+            self._buf = self._buf[drop:].copy()
+            self._buf_start += drop
+
+    def _finish(self) -> None:
+        rc = self._proc.wait()
+        self.finished = True
+        if rc != 0:
+            self._stderr.seek(0)
+            err = self._stderr.read().decode(errors="ignore").strip()
+            self._drop_sink()
+            raise AudioDecodeError(f"Failed to load audio: {err or f'ffmpeg exited with code {rc}'}")
+        if self._sink is not None:
+            try:
+                self._sink.commit()
+            except Exception as e:
+                log.debug(f"PCM sink commit failed: {e}")
+            self._sink = None
+
+    def _drop_sink(self) -> None:
+        if self._sink is not None:
+            try:
+                self._sink.abort()
+            except Exception:
+                pass
+            self._sink = None
+
+    def available(self, upto: int) -> int:
+        """Decode until at least `upto` samples exist (or EOF); return samples decoded."""
+        while not self.finished and self._decoded < upto:
+            self._read_block()
+        return self._decoded
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Return samples [start, end); `start` must not precede released data."""
+        if start < self._buf_start:
+            raise ValueError(f"PCM samples before {self._buf_start} were already released")
+        self.available(end)
+        return self._buf[start - self._buf_start:end - self._buf_start]
+
+    def release(self, upto: int) -> None:
+        """Forget samples before absolute index `upto` (also ones not decoded yet)."""
+        self._release_to = max(self._release_to, upto)
+        self._trim()
+
+    def close(self) -> None:
+        """Stop ffmpeg (if still running) and discard any partial sink output."""
+        if not self.finished:
+            try:
+                self._proc.kill()
+            except Exception:
+                pass
+            try:
+                self._proc.wait(timeout=5)
+            except Exception:
+                pass
+            self.finished = True
+            self._drop_sink()
+        try:
+            if self._proc.stdout:
+                self._proc.stdout.close()
+        except Exception:
+            pass
+        try:
+            self._stderr.close()
+        except Exception:
+            pass
+        self._buf = np.zeros(0, dtype=np.float32)
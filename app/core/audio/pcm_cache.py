@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""On-disk cache of decoded 16 kHz PCM, reopened with np.memmap on later runs."""
+from __future__ import annotations
+from pathlib import Path
+from typing import Optional
+import os
+import threading
+
+import numpy as np
+
+from app.core.audio.pcm import DecodedAudio, SAMPLE_RATE
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class PcmCache:
+    """Raw float32 PCM files keyed by file identity, bounded by a byte budget.
+
+    Each entry is `<key>.f32` (mono, SAMPLE_RATE Hz, native-endian float32), so a
+    chunk slice of the memmap is a zero-copy view and costs only page faults.
+    Entries are evicted least-recently-used first; "use" is tracked through the
+    file mtime, which is bumped on every hit.
+    """
+    SUFFIX = ".f32"
+
+    def __init__(self, root: Path, budget_bytes: int) -> None:
+        self.root = Path(root)
+        self.budget_bytes = int(budget_bytes)
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"{key}{self.SUFFIX}"
+
+    def open(self, key: str) -> Optional[DecodedAudio]:
+        """Return the cached audio as a memmap, or None on a miss."""
+        p = self.path_for(key)
+        try:
+            if not p.exists() or p.stat().st_size == 0:
+                return None
+            # copy-on-write: pages are shared with the page cache, but torch still
+            # gets a writable array (avoids its non-writable numpy warning)
+            samples = np.memmap(p, dtype=np.float32, mode="c")
+            os.utime(p)  # mark as most recently used
+        except (OSError, ValueError) as e:
+            log.debug(f"PCM cache entry unreadable, ignoring: {p} ({e})")
+            return None
+        log.debug(f"PCM cache hit: {p.name}")
+        return DecodedAudio(samples=samples, sample_rate=SAMPLE_RATE)
+
+    def store(self, key: str, audio: DecodedAudio) -> Optional[Path]:
+        """Write `audio` for `key` atomically and evict older entries over budget."""
+        if self.budget_bytes <= 0 or audio.sample_rate != SAMPLE_RATE:
+            return None
+        size = audio.num_samples * 4
+        if size > self.budget_bytes:
+            log.debug(f"PCM too large for cache budget ({size} > {self.budget_bytes} bytes), not caching")
+            return None
+
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            p = self.path_for(key)
+            tmp = p.with_name(p.name + ".tmp")
+            try:
+                np.asarray(audio.samples, dtype=np.float32).tofile(tmp)
+                os.replace(tmp, p)
+            except OSError as e:
+                log.debug(f"Failed to write PCM cache entry {p}: {e}")
+                try:
+                    tmp.unlink()
+                except OSError:
+                    pass
+                return None
+            self._evict_locked(keep=p)
+        return p
+
+    def writer(self, key: str) -> Optional["PcmCacheWriter"]:
+        """Return a sink that stores streamed blocks for `key` (see PcmStream)."""
+        if self.budget_bytes <= 0:
+            return None
+        return PcmCacheWriter(self, key)
+
+    def _commit(self, key: str, tmp: Path) -> Optional[Path]:
+        with self._lock:
+            p = self.path_for(key)
+            try:
+                os.replace(tmp, p)
+            except OSError as e:
+                log.debug(f"Failed to commit PCM cache entry {p}: {e}")
+                return None
+            self._evict_locked(keep=p)
+        return p
+
+    def _evict_locked(self, keep: Path) -> None:
+        """Delete least-recently-used entries other than `keep` until the cache fits its budget."""
+        entries = []
+        for f in self.root.glob(f"*{self.SUFFIX}"):
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, f))
+        total = sum(size for _, size, _ in entries)
+        # oldest first
+        for _, size, f in sorted(entries, key=lambda e: e[0]):
+            if total <= self.budget_bytes:
+                break
+            if f == keep:
+                continue
+            try:
+                f.unlink()
+                total -= size
+                log.debug(f"Evicted PCM cache entry: {f.name}")
+            except OSError:
+                pass
+
+
+class PcmCacheWriter:
+    """Incremental writer for one cache entry; becomes visible only on commit()."""
+
+    def __init__(self, cache: PcmCache, key: str) -> None:
+        self._cache = cache
+        self._key = key
+        self._written = 0
+        cache.root.mkdir(parents=True, exist_ok=True)
+        p = cache.path_for(key)
+        self._tmp = p.with_name(p.name + ".tmp")
+        self._fh = open(self._tmp, "wb")
+
+    def write(self, block: np.ndarray) -> None:
+        if self._fh is None:
+            return
+        self._written += block.size * 4
+        if self._written > self._cache.budget_bytes:
+            log.debug("Streamed PCM exceeds cache budget, not caching")
+            self.abort()
+            return
+        np.asarray(block, dtype=np.float32).tofile(self._fh)
+
+    def commit(self) -> Optional[Path]:
+        if self._fh is None:
+            return None
+        self._fh.close()
+        self._fh = None
+        return self._cache._commit(self._key, self._tmp)
+
+    def abort(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        try:
+            self._tmp.unlink()
+        except OSError:
+            pass
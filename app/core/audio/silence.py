@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Vectorized silence detection on 16 kHz float PCM (drop-in for pydub.silence.detect_silence)."""
+from __future__ import annotations
+from typing import List
+
+import numpy as np
+
+# Window starts are evaluated in blocks of this many ms to bound temporary memory
+_BLOCK_MS = 600_000
+
+
+def detect_silence_np(
+    samples: np.ndarray,
+    sample_rate: int,
+    min_silence_len: int = 1000,
+    silence_thresh: float = -16,
+) -> List[List[int]]:
+    """Return [start_ms, end_ms] silent regions, matching pydub's semantics.
+
+    Like `pydub.silence.detect_silence(seg, min_silence_len, silence_thresh)` with
+    `seek_step=1`: every window of `min_silence_len` ms starting on a whole ms is
+    silent when its 16-bit RMS is at or below `silence_thresh` dBFS, and silent
+    windows that touch or overlap are merged into one region. On 16-bit input
+    the regions are identical to pydub's.
+
+    Instead of computing the RMS one slice at a time in Python, per-ms energy is
+    summed once and window energies come from differences of its cumulative sum.
+
+    Args:
+        samples: mono float32 samples in [-1, 1].
+        sample_rate: sample rate of `samples` (must be a multiple of 1000 Hz).
+        min_silence_len: minimum silence length in ms.
+        silence_thresh: threshold in dBFS (full scale = 1.0).
+    """
+    if sample_rate % 1000:
+        raise ValueError(f"sample_rate must be a multiple of 1000 Hz, got {sample_rate}")
+    spm = sample_rate // 1000  # samples per ms
+    n = int(samples.shape[-1])
+    seg_len = int(round(1000 * (n / float(sample_rate))))  # pydub's len(segment)
+    win = int(min_silence_len)
+    if seg_len < win or win <= 0:
+        return []
+
+    # Per-ms energy and sample counts (last ms may be partial, like pydub's slice clamp)
+    n_ms = -(-n // spm)
+    x = np.asarray(samples, dtype=np.float32)
+    pad = n_ms * spm - n
+    if pad:
+        x = np.concatenate([x, np.zeros(pad, dtype=np.float32)])
+    energy = np.einsum("ij,ij->i", x.reshape(n_ms, spm), x.reshape(n_ms, spm), dtype=np.float64)
+    counts = np.full(n_ms, spm, dtype=np.int64)
+    if pad:
+        counts[-1] = spm - pad
+    # pydub may index one ms past the data when its rounded length rounds up
+    if seg_len > n_ms:
+        energy = np.concatenate([energy, np.zeros(seg_len - n_ms)])
+        counts = np.concatenate([counts, np.zeros(seg_len - n_ms, dtype=np.int64)])
+
+    # pydub compares the *integer* 16-bit RMS (audioop.rms truncates) with the
+    # threshold amplitude, i.e. silent <=> rms16 < floor(thresh16) + 1
+    thresh16 = np.floor(10.0 ** (silence_thresh / 20.0) * 32768.0) + 1.0
+    thresh_sq = (thresh16 / 32768.0) ** 2
+    n_starts = seg_len - win + 1
+    silent = np.empty(n_starts, dtype=bool)
+    for b0 in range(0, n_starts, _BLOCK_MS):
+        b1 = min(n_starts, b0 + _BLOCK_MS)
+        e = np.concatenate([[0.0], np.cumsum(energy[b0:b1 + win - 1])])
+        c = np.concatenate([[0], np.cumsum(counts[b0:b1 + win - 1])])
+        w_energy = e[win:] - e[:-win]
+        w_count = np.maximum(c[win:] - c[:-win], 1)
+        silent[b0:b1] = w_energy / w_count < thresh_sq
+
+    # Runs of consecutive silent window starts
+    edges = np.diff(silent.astype(np.int8), prepend=0, append=0)
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1) - 1  # last silent start in each run
+    if run_starts.size == 0:
+        return []
+
+    # pydub also merges runs whose windows touch or overlap (gap <= min_silence_len)
+    keep = np.concatenate([[True], run_starts[1:] > run_ends[:-1] + win])
+    starts = run_starts[keep]
+    ends = run_ends[np.concatenate([keep[1:], [True]])]
+    return [[int(s), int(e) + win] for s, e in zip(starts, ends)]
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Energy-based speech activity: drop long non-speech spans before inference."""
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from app.core.audio.silence import detect_silence_np
+
+
+@dataclass
+class SpeechMap:
+    """Where the kept (speech) spans of a chunk came from.
+
+    `spans` are [start, end) sample ranges of the original chunk that were kept
+    and concatenated, in order. Times reported on the condensed audio (e.g. by
+    Whisper segments) are mapped back to chunk time with `to_original`.
+    """
+    spans: List[Tuple[int, int]]
+    sample_rate: int
+    _cond_starts: List[float] = field(default_factory=list, repr=False)
+    _cond_ends: List[float] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        acc = 0
+        for a, b in self.spans:
+            self._cond_starts.append(acc / self.sample_rate)
+            acc += b - a
+            self._cond_ends.append(acc / self.sample_rate)
+
+    @property
+    def kept_s(self) -> float:
+        return self._cond_ends[-1] if self._cond_ends else 0.0
+
+    def to_original(self, t: float, is_end: bool = False) -> float:
+        """Map condensed time `t` (s) to chunk time (s).
+
+        At a joint between two spans a segment *end* belongs to the earlier span
+        and a segment *start* to the later one.
+        """
+        if not self.spans:
+            return 0.0
+        if is_end:
+            j = min(bisect_left(self._cond_ends, t), len(self.spans) - 1)
+        else:
+            j = max(bisect_right(self._cond_starts, t) - 1, 0)
+        a, b = self.spans[j]
+        offset = min(max(t - self._cond_starts[j], 0.0), (b - a) / self.sample_rate)
+        return a / self.sample_rate + offset
+
+
+def prune_non_speech(
+    samples: np.ndarray,
+    sample_rate: int,
+    min_gap_s: float,
+    silence_thresh_dbfs: float,
+    pad_ms: int = 200,
+) -> Tuple[np.ndarray, SpeechMap]:
+    """Remove non-speech spans of at least `min_gap_s` from a chunk.
+
+    Uses the chunker's silence detector (same threshold) with `min_gap_s` as the
+    minimum length; `pad_ms` of each removed span is kept next to speech so word
+    onsets and tails are not clipped. Returns the condensed samples (empty if the
+    chunk holds no speech at all) and the map back to chunk time.
+    """
+    n = int(samples.shape[-1])
+    spm = sample_rate / 1000.0
+    gaps = detect_silence_np(samples, sample_rate, int(min_gap_s * 1000), silence_thresh_dbfs)
+
+    spans: List[Tuple[int, int]] = []
+    pos = 0
+    for s_ms, e_ms in gaps:
+        # keep padding around speech, but not at the chunk edges
+        cut_a = int(s_ms * spm) + (int(pad_ms * spm) if s_ms > 0 else 0)
+        cut_b = min(n, int(e_ms * spm)) - (int(pad_ms * spm) if int(e_ms * spm) < n else 0)
+        if cut_b <= cut_a:
+            continue
+        if cut_a > pos:
+            spans.append((pos, cut_a))
+        pos = cut_b
+    if pos < n:
+        spans.append((pos, n))
+
+    smap = SpeechMap(spans=spans, sample_rate=sample_rate)
+    if len(spans) == 1 and spans[0] == (0, n):
+        return samples, smap
+    if not spans:
+        return samples[:0], smap
+    return np.concatenate([samples[a:b] for a, b in spans]), smap
@@ -40,6 +40,7 @@ class WorkerSignals(QObject):
     # NEW: for transcript UI streaming
     partial_text   = Signal(str)  # per-chunk text to append
     bootstrap_text = Signal(str)  # initial resume text
+    chunk_text     = Signal(int, str)  # two-pass: (slot, text) inserts or replaces a chunk's text
     
 @dataclass
 class TaskSpec:
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""Speech-to-text backends: the engines the chunked driver can run chunks on.
+
+A backend loads a model for a job, transcribes one chunk of 16 kHz mono PCM at
+a time into `{"text", "segments": [{"start", "end", "text"}]}` (times relative
+to the chunk), and releases the model on `close()`. Chunking, VAD pruning,
+checkpoints and streaming stay in the driver, so a backend never sees more
+than one chunk. Loaded models live in MODEL_MANAGER, keyed by backend name.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+import importlib
+import importlib.util
+import os
+
+import numpy as np
+
+import logging
+log = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "whisper"
+
+
+@dataclass(frozen=True)
+class BackendCapabilities:
+    devices: Tuple[str, ...]            # devices the engine can run on
+    quantize_devices: Tuple[str, ...]   # devices where `quantize` selects an int8 model
+    batching: bool = False              # chunks can be batched through ChunkBatcher
+    worker_pool: bool = False           # CPU jobs can fan out over ChunkPool processes
+    segment_timestamps: bool = True
+    language_detection: bool = True
+
+
+class SttBackend:
+    """Base class of the backends; subclasses implement the class-level loader hooks."""
+
+    name = ""
+    capabilities = BackendCapabilities(devices=("cpu",), quantize_devices=())
+
+    def __init__(self, model_name: str, device: str, models_dir: Path, quantize: bool = False) -> None:
+        self.model_name = model_name
+        self.device = device
+        self.models_dir = Path(models_dir)
+        self.quantize = bool(quantize) and device in self.capabilities.quantize_devices
+        self.model = None
+
+    # --- per-model hooks (used by MODEL_MANAGER and the UI) ---
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @classmethod
+    def is_model_cached(cls, model_name: str, models_dir: Path) -> bool:
+        raise NotImplementedError
+
+    @classmethod
+    def load_model(cls, model_name: str, device: str, models_dir: Path, quantize: bool):
+        raise NotImplementedError
+
+    # --- per-job API ---
+    def load(self, warm_up: bool = False) -> None:
+        """Acquire the model from MODEL_MANAGER (loading it if needed); pinned until `close()`.
+
+        With `warm_up`, a model loaded by this call gets one warm-up inference
+        before any other caller can use it.
+        """
+        from app.core.stt.chunked_transcriber import MODEL_MANAGER
+        self.model = MODEL_MANAGER.acquire(self.model_name, self.device, self.models_dir,
+                                           self.quantize, backend=self.name,
+                                           warm_up=self._warm_up_loaded if warm_up else None)
+
+    def _warm_up_loaded(self, model) -> None:
+        self.model = model
+        self.warm_up()
+
+    def transcribe(self, samples: np.ndarray, language: Optional[str]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def detect_language(self, samples: np.ndarray) -> Dict[str, float]:
+        """Language probabilities for (up to 30 s of) `samples`; needs `capabilities.language_detection`."""
+        raise NotImplementedError
+
+    def warm_up(self) -> None:
+        """One short inference so the first real chunk skips one-time initialization."""
+        self.transcribe(np.zeros(16000, dtype=np.float32), "en")
+
+    def close(self) -> None:
+        if self.model is not None:
+            from app.core.stt.chunked_transcriber import MODEL_MANAGER
+            MODEL_MANAGER.release(self.model)
+            self.model = None
+
+
+class WhisperBackend(SttBackend):
+    """openai-whisper (PyTorch); the reference engine and the only one with batching and worker pools."""
+
+    name = "whisper"
+    capabilities = BackendCapabilities(
+        devices=("cpu", "cuda", "mps"), quantize_devices=("cpu",), batching=True, worker_pool=True,
+    )
+
+    @classmethod
+    def is_available(cls) -> bool:
+        # find_spec only: importing whisper would pull in torch
+        return importlib.util.find_spec("whisper") is not None
+
+    @classmethod
+    def is_model_cached(cls, model_name: str, models_dir: Path) -> bool:
+        from app.core.stt.whisper_runner import is_model_cached
+        return is_model_cached(model_name, Path(models_dir))
+
+    @classmethod
+    def load_model(cls, model_name: str, device: str, models_dir: Path, quantize: bool):
+        try:
+            importlib.import_module("whisper")
+        except Exception as e:
+            # Log the actual error for debugging
+            import traceback
+            error_details = traceback.format_exc()
+            raise RuntimeError(f"openai-whisper is not installed. Run: pip install openai-whisper\n\nActual error:\n{error_details}") from e
+        from app.core.stt.whisper_runner import load_whisper_model
+        return load_whisper_model(model_name, device, Path(models_dir), quantize=quantize)
+
+    @property
+    def fp16(self) -> bool:
+        # half precision on CUDA and MPS
+        return self.device in ("cuda", "mps")
+
+    def transcribe(self, samples: np.ndarray, language: Optional[str]) -> Dict[str, Any]:
+        return self.model.transcribe(samples, language=language, task="transcribe", fp16=self.fp16, verbose=False)
+
+    def detect_language(self, samples: np.ndarray) -> Dict[str, float]:
+        from app.core.stt.whisper_runner import detect_language
+        return detect_language(self.model, samples, fp16=self.fp16)
+
+    def warm_up(self) -> None:
+        from app.core.stt.preload import warm_up
+        warm_up(self.model, fp16=self.fp16)
+
+
+class FasterWhisperBackend(SttBackend):
+    """faster-whisper: Whisper weights converted to CTranslate2, with fused int8/fp16 CPU/CUDA kernels.
+
+    Needs the optional `faster-whisper` package. Converted models are fetched
+    on first use into a `faster-whisper` directory next to the Whisper models.
+    Decoding is greedy like the default Whisper path; CTranslate2 parallelizes
+    a chunk over all cores itself, so there is no worker pool.
+    """
+
+    name = "faster-whisper"
+    capabilities = BackendCapabilities(devices=("cpu", "cuda"), quantize_devices=("cpu", "cuda"))
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            importlib.import_module("faster_whisper")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _download_root(models_dir: Path) -> Path:
+        return Path(models_dir).parent / "faster-whisper"
+
+    @classmethod
+    def is_model_cached(cls, model_name: str, models_dir: Path) -> bool:
+        root = cls._download_root(models_dir)
+        # huggingface_hub cache layout: models--<org>--faster-whisper-<name>
+        return root.is_dir() and any(root.glob(f"models--*--*-{model_name}"))
+
+    @classmethod
+    def load_model(cls, model_name: str, device: str, models_dir: Path, quantize: bool):
+        from faster_whisper import WhisperModel  # type: ignore
+        if quantize:
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+        else:
+            compute_type = "float16" if device == "cuda" else "float32"
+        root = cls._download_root(models_dir)
+        root.mkdir(parents=True, exist_ok=True)
+        return WhisperModel(model_name, device=device, compute_type=compute_type,
+                            cpu_threads=os.cpu_count() or 0, download_root=str(root))
+
+    def transcribe(self, samples: np.ndarray, language: Optional[str]) -> Dict[str, Any]:
+        segments, _info = self.model.transcribe(
+            samples, language=language, task="transcribe", beam_size=1, vad_filter=False,
+        )
+        # the segment generator does the decoding; drain it here
+        segs: List[Dict[str, Any]] = [
+            {
+                "start": float(s.start), "end": float(s.end), "text": s.text,
+                "avg_logprob": s.avg_logprob, "compression_ratio": s.compression_ratio,
+                "no_speech_prob": s.no_speech_prob,
+            }
+            for s in segments
+        ]
+        return {"text": "".join(s["text"] for s in segs), "segments": segs}
+
+    def detect_language(self, samples: np.ndarray) -> Dict[str, float]:
+        # detection runs eagerly in transcribe(); the returned segment generator is never consumed
+        _segments, info = self.model.transcribe(samples[:30 * 16000], task="transcribe", beam_size=1)
+        probs = getattr(info, "all_language_probs", None)
+        return dict(probs) if probs else {info.language: float(info.language_probability)}
+
+
+BACKENDS: Dict[str, Type[SttBackend]] = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def get_backend(name: Optional[str]) -> Type[SttBackend]:
+    """Backend class registered under `name` ("" or None = the default)."""
+    try:
+        return BACKENDS[name or DEFAULT_BACKEND]
+    except KeyError:
+        raise ValueError(f"Unknown transcription backend: {name!r} (available: {', '.join(BACKENDS)})") from None
+
+
+def available_backends() -> List[str]:
+    """Names of the backends whose engine is installed."""
+    return [name for name, cls in BACKENDS.items() if cls.is_available()]
+
+
+def create_backend(name: Optional[str], model_name: str, device: str, models_dir: Path,
+                   quantize: bool = False) -> SttBackend:
+    """Instantiate a backend for a job, falling back to CPU on devices it does not support."""
+    cls = get_backend(name)
+    if not cls.is_available():
+        raise RuntimeError(f"Transcription backend '{cls.name}' is not installed")
+    if device not in cls.capabilities.devices:
+        log.info(f"Backend '{cls.name}' does not support {device}; using cpu")
+        device = "cpu"
+    return cls(model_name, device, models_dir, quantize)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""Batched Whisper inference: one encoder pass and one greedy decode for several chunks."""
+from __future__ import annotations
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+import time
+
+import numpy as np
+
+import logging
+log = logging.getLogger(__name__)
+
+# Same quality gates as whisper.transcribe's temperature fallback
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+def _mel_window(model, samples: np.ndarray):
+    """Log-mel of one chunk padded to a single 30 s window, as whisper.transcribe builds it."""
+    from whisper.audio import N_FRAMES, N_SAMPLES, log_mel_spectrogram, pad_or_trim  # type: ignore
+    mel = log_mel_spectrogram(samples, model.dims.n_mels, padding=N_SAMPLES)
+    content_frames = mel.shape[-1] - N_FRAMES
+    return pad_or_trim(mel[:, :content_frames], N_FRAMES)
+
+
+def _segments_from_tokens(tokenizer, tokens: List[int], duration_s: float, result) -> List[Dict[str, Any]]:
+    """Split a timestamped token sequence into {'start','end','text',...} segments."""
+    from whisper.audio import HOP_LENGTH, SAMPLE_RATE  # type: ignore
+    ts_begin = tokenizer.timestamp_begin
+    # two mel frames per output token: 0.02 s per timestamp step
+    precision = 2 * HOP_LENGTH / SAMPLE_RATE
+
+    segments: List[Dict[str, Any]] = []
+    start: Optional[float] = None
+    text_tokens: List[int] = []
+
+    def _close(end: float) -> None:
+        text = tokenizer.decode([t for t in text_tokens if t < tokenizer.eot])
+        if text.strip():
+            segments.append({
+                "start": min(start or 0.0, duration_s),
+                "end": min(max(end, start or 0.0), duration_s),
+                "text": text,
+                "avg_logprob": result.avg_logprob,
+                "compression_ratio": result.compression_ratio,
+                "no_speech_prob": result.no_speech_prob,
+            })
+
+    for t in tokens:
+        if t >= ts_begin:
+            ts = (t - ts_begin) * precision
+            if start is not None and text_tokens:
+                _close(ts)
+                start, text_tokens = None, []
+            else:
+                start = ts  # opening timestamp (or the start half of an end/start pair)
+        else:
+            text_tokens.append(t)
+    if text_tokens:
+        _close(duration_s)
+    return segments
+
+
+def _needs_seek(tokens: List[int], ts_begin: int, duration_s: float, sample_len: int) -> bool:
+    """Whether whisper.transcribe would decode this window again from its last timestamp.
+
+    It does so when the decode hit `sample_len`, or when the tokens hold
+    end/start timestamp pairs but do not end with a single closing timestamp
+    (they stop on an opened segment or after a trailing pair): the speech after
+    the last timestamp is then still to be transcribed. A single decode would
+    lose it, unless that timestamp is already at the end of the audio.
+    """
+    if len(tokens) >= sample_len:
+        return True
+    is_ts = [t >= ts_begin for t in tokens]
+    if not any(a and b for a, b in zip(is_ts, is_ts[1:])):
+        return False  # no pairs: whisper takes the window as one segment too
+    if is_ts[-2:] == [False, True]:
+        return False  # single timestamp ending: the window is complete
+    # two mel frames per output token: 0.02 s per timestamp step
+    last_ts = (max(t for t in tokens if t >= ts_begin) - ts_begin) * 0.02
+    return last_ts < duration_s - 0.1
+
+
+def transcribe_batch(model, chunks: List[np.ndarray], language: Optional[str], fp16: bool) -> List[Tuple[Dict[str, Any], float]]:
+    """Transcribe chunks of at most one window each; returns [(result, seconds)] in order.
+
+    The mels are stacked and encoded in one `model.embed_audio` call, then all
+    chunks are decoded together at temperature 0. A chunk whose decode fails
+    Whisper's compression/log-prob gates, stops before the end of its speech
+    (see `_needs_seek`), or is longer than one window is re-run alone through
+    `model.transcribe`, which retries at higher temperatures and seeks. The batch time is split across chunks by length.
+    """
+    import torch  # type: ignore
+    import whisper  # type: ignore
+    from whisper.audio import N_SAMPLES, SAMPLE_RATE  # type: ignore
+    from whisper.tokenizer import get_tokenizer  # type: ignore
+
+    out: List[Optional[Tuple[Dict[str, Any], float]]] = [None] * len(chunks)
+    batch_idx = [i for i, c in enumerate(chunks) if 0 < c.shape[-1] <= N_SAMPLES]
+    fallback = [i for i, c in enumerate(chunks) if c.shape[-1] > N_SAMPLES]
+    for i, c in enumerate(chunks):
+        if c.shape[-1] == 0:
+            out[i] = ({"text": "", "segments": []}, 0.0)
+
+    if batch_idx:
+        t = time.time()
+        dtype = torch.float16 if fp16 else torch.float32
+        with torch.no_grad():
+            mel = torch.stack([_mel_window(model, chunks[i]) for i in batch_idx]).to(model.device).to(dtype)
+            features = model.embed_audio(mel)
+            options = whisper.DecodingOptions(task="transcribe", language=language, fp16=fp16, temperature=0.0)
+            results = whisper.decode(model, features, options)
+        sample_len = options.sample_len or model.dims.n_text_ctx // 2
+        elapsed = time.time() - t
+        total_len = sum(chunks[i].shape[-1] for i in batch_idx)
+
+        for i, r in zip(batch_idx, results):
+            share = elapsed * chunks[i].shape[-1] / total_len
+            silent = r.no_speech_prob > NO_SPEECH_THRESHOLD and r.avg_logprob < LOGPROB_THRESHOLD
+            if silent:
+                out[i] = ({"text": "", "segments": [], "language": r.language}, share)
+                continue
+            if r.compression_ratio > COMPRESSION_RATIO_THRESHOLD or r.avg_logprob < LOGPROB_THRESHOLD:
+                fallback.append(i)
+                continue
+            tokenizer = get_tokenizer(
+                model.is_multilingual, num_languages=model.num_languages,
+                language=r.language, task="transcribe",
+            )
+            duration_s = chunks[i].shape[-1] / float(SAMPLE_RATE)
+            if _needs_seek(r.tokens, tokenizer.timestamp_begin, duration_s, sample_len):
+                fallback.append(i)
+                continue
+            segs = _segments_from_tokens(tokenizer, r.tokens, duration_s, r)
+            out[i] = ({"text": r.text, "segments": segs, "language": r.language}, share)
+
+    for i in sorted(fallback):
+        t = time.time()
+        res = model.transcribe(chunks[i], language=language, task="transcribe", fp16=fp16, verbose=False)
+        prev = out[i][1] if out[i] is not None else 0.0
+        out[i] = (res, prev + time.time() - t)
+
+    if fallback:
+        log.debug(f"Batched decode: {len(fallback)}/{len(chunks)} chunks fell back to model.transcribe")
+    return out  # type: ignore[return-value]
+
+
+class ChunkBatcher:
+    """Collects chunks into batches of `batch_size` and runs them on first need.
+
+    `submit` returns a Future that is resolved when its batch runs: as soon as
+    the batch is full, or when the caller needs a result and calls `flush`.
+    """
+
+    def __init__(self, model, batch_size: int, language: Optional[str], fp16: bool) -> None:
+        self._model = model
+        self.batch_size = max(1, int(batch_size))
+        self._language = language
+        self._fp16 = fp16
+        self._pending: List[Tuple[np.ndarray, Future]] = []
+
+    def submit(self, samples: np.ndarray) -> Future:
+        fut: Future = Future()
+        self._pending.append((samples, fut))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return fut
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            results = transcribe_batch(self._model, [s for s, _ in pending], self._language, self._fp16)
+        except Exception as e:
+            for _, fut in pending:
+                fut.set_exception(e)
+            return
+        for (_, fut), r in zip(pending, results):
+            fut.set_result(r)
+
+    def cancel(self) -> None:
+        for _, fut in self._pending:
+            fut.cancel()
+        self._pending = []
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Confidence cascade: re-decode only the chunks a fast model was unsure about with a bigger one."""
+from __future__ import annotations
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.core.stt.backends import SttBackend, create_backend, get_backend
+from app.core.stt.batched import COMPRESSION_RATIO_THRESHOLD, LOGPROB_THRESHOLD, NO_SPEECH_THRESHOLD
+from app.core.stt.chunk_cache import model_tag
+
+import logging
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class CascadeConfig:
+    # Larger model for low-confidence chunks; "" disables the cascade
+    model: str = ""
+    # A segment fails when its mean token log-prob is below this...
+    logprob_threshold: float = LOGPROB_THRESHOLD
+    # ...unless the window is probably not speech at all (then low log-prob is expected)
+    no_speech_threshold: float = NO_SPEECH_THRESHOLD
+    # A segment also fails when its text is this repetitive (gzip ratio)
+    compression_ratio_threshold: float = COMPRESSION_RATIO_THRESHOLD
+
+
+def escalation_reason(res: Dict[str, Any], cfg: CascadeConfig) -> Optional[str]:
+    """Why a chunk result should be re-decoded with the bigger model, or None if it is fine.
+
+    Uses the per-segment statistics Whisper reports; segments without them
+    (e.g. engines that do not expose them) never escalate.
+    """
+    for sg in res.get("segments") or []:
+        if not (sg.get("text") or "").strip():
+            continue
+        ratio = sg.get("compression_ratio")
+        if ratio is not None and ratio > cfg.compression_ratio_threshold:
+            return "compression_ratio"
+        logprob = sg.get("avg_logprob")
+        no_speech = sg.get("no_speech_prob")
+        if logprob is not None and logprob < cfg.logprob_threshold:
+            if no_speech is None or no_speech <= cfg.no_speech_threshold:
+                return "avg_logprob"
+    return None
+
+
+@dataclass
+class CascadeStats:
+    model: str
+    chunks: int = 0
+    escalated_chunks: int = 0
+    audio_s: float = 0.0
+    escalated_s: float = 0.0
+    escalated_compute_s: float = 0.0
+    reasons: Counter = field(default_factory=Counter)
+
+    def add(self, audio_s: float, reason: Optional[str], compute_s: float = 0.0) -> None:
+        self.chunks += 1
+        self.audio_s += audio_s
+        if reason:
+            self.escalated_chunks += 1
+            self.escalated_s += audio_s
+            self.escalated_compute_s += compute_s
+            self.reasons[reason] += 1
+
+    def summary(self) -> str:
+        share = 100.0 * self.escalated_s / max(self.audio_s, 1e-6)
+        why = ", ".join(f"{k} {v}" for k, v in self.reasons.most_common())
+        return (
+            f"Cascade: {share:.0f}% of audio ({self.escalated_chunks}/{self.chunks} chunks) "
+            f"re-decoded with '{self.model}'" + (f" ({why}); {self.escalated_compute_s:.1f}s compute" if why else "")
+        )
+
+
+class Escalator:
+    """The cascade's bigger model, loaded on the first chunk that needs it."""
+
+    def __init__(self, cfg: CascadeConfig, backend_name: str, device: str, models_dir, quantize: bool) -> None:
+        self.cfg = cfg
+        self.stats = CascadeStats(model=cfg.model)
+        self._backend: Optional[SttBackend] = None
+        self._args = (backend_name, cfg.model, device, models_dir, quantize)
+        # chunk cache tag of the cascade model's results
+        caps = get_backend(backend_name).capabilities
+        run_on = device if device in caps.devices else "cpu"  # as create_backend falls back
+        int8 = quantize and run_on in caps.quantize_devices
+        self.model_tag = model_tag(get_backend(backend_name).name, cfg.model, int8, run_on)
+
+    def transcribe(self, samples: np.ndarray, language: Optional[str]) -> Dict[str, Any]:
+        if self._backend is None:
+            backend = create_backend(*self._args)
+            log.info(f"Cascade: loading '{self.cfg.model}' for low-confidence chunks")
+            backend.load()
+            self._backend = backend
+        return self._backend.transcribe(samples, language)
+
+    def close(self) -> None:
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
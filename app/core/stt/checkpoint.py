@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""Append-only checkpoint journal: a header line plus one JSON line per completed chunk.
+
+A job's progress used to be saved by rewriting one JSON document with every
+accumulated segment after each chunk, which costs O(file length) per chunk.
+The journal appends a single record instead, so per-chunk cost is constant:
+
+    {"type": "header", "version": 1, ...job options...}
+    {"type": "chunk", "start": 0.0, "end": 29.8, "total": 3600.0, "text": "...", "segments": [...]}
+    {"type": "draft", "start": 29.8, "end": 58.1, "content": ...}
+    {"type": "done"}
+    {"type": "snapshot", "done_until_s": ..., "text_parts": [...], "segments": [...], "drafts": [...], "complete": false}
+
+Chunk records carry both the chunk's text and its segments, so a finished
+job can be put out as plain text or SRT without transcribing it again.
+
+Records are written by a background thread, so a slow disk never stalls the
+chunk loop: records queued while a write is in progress go out together in
+one write and one fsync. The queue is bounded (callers wait when the writer
+falls that far behind), and `flush()`/`close()` block until everything
+queued is on disk, which the driver does on cancel and at job end.
+
+Replay stops at the first line that does not parse (a write torn by a
+crash), and appending resumes after the last good line. Compaction rewrites
+the journal as header plus one snapshot (atomically, via a temporary file)
+to drop drafts that were later refined; it runs when enough of them pile up
+and when a job stops.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import os
+import threading
+
+import logging
+log = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 1
+# Superseded records tolerated before the journal is compacted
+COMPACT_STALE_RECORDS = 256
+# Records queued for the writer before callers wait for it
+MAX_PENDING_RECORDS = 64
+# Header fields that decide how draft records are shown: drafts made under others are dropped
+DRAFT_FORMAT_KEYS = ("draft_model", "with_timestamps")
+
+
+def _dumps(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _draft_key(start_s: float, end_s: float) -> Tuple[float, float]:
+    return (round(float(start_s), 3), round(float(end_s), 3))
+
+
+class _State:
+    """Progress folded from the journal records."""
+
+    def __init__(self) -> None:
+        self.done_until = 0.0
+        self.total = 0.0
+        self.text_parts: List[str] = []
+        self.segments: List[Dict[str, Any]] = []
+        self.drafts: Dict[Tuple[float, float], Any] = {}
+        self.complete = False
+        self.stale = 0
+
+    def apply(self, rec: Dict[str, Any]) -> None:
+        kind = rec.get("type")
+        if kind == "chunk":
+            self.done_until = float(rec["end"])
+            self.total = float(rec.get("total", self.total))
+            if rec.get("text"):
+                self.text_parts.append(rec["text"])
+            self.segments.extend(rec.get("segments") or [])
+            if self.drafts.pop(_draft_key(rec["start"], rec["end"]), None) is not None:
+                self.stale += 1
+        elif kind == "draft":
+            self.drafts[_draft_key(rec["start"], rec["end"])] = rec.get("content")
+        elif kind == "done":
+            self.complete = True
+            self.stale += len(self.drafts)
+            self.drafts = {}
+        elif kind == "snapshot":
+            self.done_until = float(rec.get("done_until_s", 0.0))
+            self.total = float(rec.get("duration_s", 0.0))
+            self.text_parts = list(rec.get("text_parts") or [])
+            self.segments = list(rec.get("segments") or [])
+            self.drafts = {_draft_key(d["start"], d["end"]): d.get("content") for d in rec.get("drafts") or []}
+            self.complete = bool(rec.get("complete"))
+            self.stale = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "type": "snapshot",
+            "done_until_s": self.done_until,
+            "duration_s": self.total,
+            "text_parts": self.text_parts,
+            "segments": self.segments,
+            "drafts": self.pending_drafts(),
+            "complete": self.complete,
+        }
+
+    def pending_drafts(self) -> List[Dict[str, Any]]:
+        return [
+            {"start": a, "end": b, "content": c}
+            for (a, b), c in sorted(self.drafts.items()) if a >= self.done_until - 1e-3
+        ]
+
+
+def load_journal(path: Path) -> Optional[Dict[str, Any]]:
+    """Replay the journal at `path` into a checkpoint dict, or None if there is none.
+
+    The dict holds the header fields plus `done_until_s`, `duration_s`,
+    `text_parts`, `text_accum`, `segments_accum`, `drafts` (not yet refined)
+    and `complete` (the job ran to the end).
+    """
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+    except OSError:
+        return None
+
+    header: Optional[Dict[str, Any]] = None
+    state = _State()
+    good = 0
+    for line in data.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break  # torn final write
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            break
+        if header is None:
+            if rec.get("type") != "header" or rec.get("version") != JOURNAL_VERSION:
+                return None
+            header = rec
+        else:
+            state.apply(rec)
+        good += len(line)
+    if header is None:
+        return None
+    if good < len(data):
+        log.debug(f"Checkpoint journal {path.name}: ignoring {len(data) - good} bytes after the last complete record")
+
+    ck = {k: v for k, v in header.items() if k not in ("type", "version")}
+    ck.update({
+        "done_until_s": state.done_until,
+        "duration_s": state.total or header.get("duration_s", 0.0),
+        "text_parts": state.text_parts,
+        "text_accum": "\n".join(p for p in state.text_parts if p).strip(),
+        "segments_accum": state.segments,
+        "drafts": state.pending_drafts(),
+        "complete": state.complete,
+        "_journal_size": good,
+        "_journal_state": state,
+    })
+    return ck
+
+
+class CheckpointJournal:
+    """Writer for one job's journal; thread-safe (the draft pass records from its own thread).
+
+    Records update the in-memory state right away and are queued for the
+    writer thread; all file I/O after `start()` happens on that thread.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._cond = threading.Condition()
+        self._fh = None
+        self._header: Dict[str, Any] = {}
+        self._state = _State()
+        self._pending: List[Dict[str, Any]] = []
+        self._queued = 0                      # records queued so far...
+        self._written = 0                     # ...and how many of them are on disk
+        self._compact = False
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, header: Dict[str, Any], ck: Optional[Dict[str, Any]] = None) -> None:
+        """Continue the journal `ck` was replayed from, or start a new one with `header`.
+
+        A resumed journal whose header differs (e.g. a language detected only
+        now) is compacted under the new header, without drafts recorded for
+        another draft model or timestamp format.
+        """
+        self._header = {"type": "header", "version": JOURNAL_VERSION, **header}
+        if ck is not None and "_journal_state" in ck:
+            self._state = ck["_journal_state"]
+            if any(ck.get(k) != header.get(k) for k in DRAFT_FORMAT_KEYS):
+                self._state.drafts = {}
+            old = {k: v for k, v in ck.items() if k in header}
+            if old == header:
+                self._fh = open(self.path, "r+b")
+                self._fh.truncate(int(ck["_journal_size"]))
+                self._fh.seek(0, os.SEEK_END)
+        if self._fh is None:
+            self._rewrite(self._snapshot_bytes())
+        self._thread = threading.Thread(target=self._run, name="VoiceTransor-checkpoint", daemon=True)
+        self._thread.start()
+
+    def chunk(self, start_s: float, end_s: float, total_s: float, text: str,
+              segments: List[Dict[str, Any]]) -> None:
+        """Record a completed chunk: its text and its segments on the file timeline."""
+        self._record({"type": "chunk", "start": start_s, "end": end_s, "total": total_s,
+                      "text": text, "segments": segments})
+
+    def draft(self, start_s: float, end_s: float, content: Any) -> None:
+        self._record({"type": "draft", "start": start_s, "end": end_s, "content": content})
+
+    def finish(self) -> None:
+        """Record that every chunk of the job is done."""
+        self._record({"type": "done"})
+
+    def compact(self) -> None:
+        with self._cond:
+            self._compact = True
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until every record queued so far (and a requested compaction) is on disk."""
+        with self._cond:
+            target = self._queued
+            while self._thread is not None and (self._written < target or self._compact):
+                self._cond.wait()
+
+    def close(self, compact: bool = False) -> None:
+        """Write everything still queued (then compact, if asked) and stop the writer."""
+        with self._cond:
+            if self._thread is None:
+                return
+            self._compact = self._compact or compact
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+        with self._cond:
+            self._thread = None
+            self._cond.notify_all()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def _record(self, rec: Dict[str, Any]) -> None:
+        with self._cond:
+            while len(self._pending) >= MAX_PENDING_RECORDS and self._thread is not None:
+                self._cond.wait()  # the writer is far behind: let it catch up
+            self._state.apply(rec)
+            if self._thread is None:
+                return  # closed (or never started): state only
+            self._pending.append(rec)
+            self._queued += 1
+            if self._state.stale >= COMPACT_STALE_RECORDS:
+                self._compact = True
+            self._cond.notify_all()
+
+    def _snapshot_bytes(self) -> bytes:
+        return (_dumps(self._header) + _dumps(self._state.snapshot())).encode("utf-8")
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not (self._pending or self._compact or self._closing):
+                    self._cond.wait()
+                batch, self._pending = self._pending, []
+                target = self._queued
+                snapshot = None
+                if self._compact:
+                    # the state already includes the batch: the snapshot replaces it
+                    snapshot = self._snapshot_bytes()
+                    self._state.stale = 0
+                self._cond.notify_all()  # room in the queue again
+            try:
+                if snapshot is not None:
+                    self._rewrite(snapshot)
+                elif batch:
+                    self._fh.write("".join(_dumps(r) for r in batch).encode("utf-8"))
+                    self._fh.flush()
+                    os.fsync(self._fh.fileno())
+            except Exception as e:
+                log.warning(f"Failed to write checkpoint {self.path.name}: {e}")
+            with self._cond:
+                self._written = target
+                if snapshot is not None:
+                    self._compact = False
+                self._cond.notify_all()
+                if self._closing and not self._pending and not self._compact:
+                    return
+
+    def _rewrite(self, data: bytes) -> None:
+        """Atomically replace the journal with `data` (header + snapshot) and reopen it for appending."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+        self._fh = open(self.path, "ab")
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""Content-addressed cache of per-chunk transcription results.
+
+A chunk's result depends only on the samples the model saw and how the model
+decoded them, so it is keyed by a hash of the chunk PCM (after non-speech
+pruning) plus the model tag (weights, precision, batching) and language. An
+identical chunk in any later job is served without inference: the same
+file re-chunked or with timestamps toggled, a trimmed copy, or the intro
+jingle every episode of a podcast starts with. Cached times are relative to
+the chunk, like a backend result, and are mapped onto the file timeline by
+the driver.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+import logging
+log = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+# Segment fields kept: timing/text plus the confidence statistics the cascade reads
+_SEGMENT_FIELDS = ("start", "end", "text", "avg_logprob", "compression_ratio", "no_speech_prob")
+
+
+def model_tag(backend_name: str, model_name: str, quantize: bool, device: str, batched: bool = False) -> str:
+    """What produced a result: int8 weights, half precision (every backend runs fp16 off the CPU)
+    and batched decoding each give different text than the full-precision sequential path."""
+    precision = "fp16" if device != "cpu" else "fp32"
+    return f"{backend_name}:{model_name}:{'int8' if quantize else 'full'}:{precision}:{'batched' if batched else 'seq'}"
+
+
+def chunk_key(samples: np.ndarray, tag: str, language: Optional[str]) -> str:
+    h = hashlib.sha1(f"v{CACHE_VERSION}|{tag}|{language or ''}|".encode("utf-8"))
+    h.update(np.ascontiguousarray(samples, dtype=np.float32).tobytes())
+    return h.hexdigest()
+
+
+@dataclass
+class ChunkCacheStats:
+    """Lookups of one job (a cascade chunk may look up twice); `hit_audio_s` counts audio seconds served."""
+    hits: int = 0
+    misses: int = 0
+    hit_audio_s: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Chunk cache: {self.hits}/{self.hits + self.misses} results reused "
+            f"({100.0 * self.hit_rate:.0f}%, {self.hit_audio_s:.1f}s of audio not transcribed again)"
+        )
+
+
+class ChunkCache:
+    """Chunk results as small JSON files keyed by `chunk_key`, bounded by a byte budget.
+
+    Entries are evicted least-recently-used first; "use" is tracked through the
+    file mtime, bumped on every hit. Sizes are indexed in memory on first use
+    so storing a chunk does not rescan the directory.
+    """
+    SUFFIX = ".json"
+
+    def __init__(self, root: Path, budget_bytes: int) -> None:
+        self.root = Path(root)
+        self.budget_bytes = int(budget_bytes)
+        self.stats = ChunkCacheStats()
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Tuple[float, int]]] = None  # name -> (mtime, size)
+        self._total = 0
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str, audio_s: float = 0.0) -> Optional[Dict[str, Any]]:
+        """Cached result for `key` ({"text", "segments"}), or None on a miss."""
+        p = self.path_for(key)
+        try:
+            res = json.loads(p.read_text(encoding="utf-8"))
+            os.utime(p)  # mark as most recently used
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats.misses += 1
+            return None
+        with self._lock:
+            self.stats.hits += 1
+            self.stats.hit_audio_s += audio_s
+            if self._index is not None and p.name in self._index:
+                self._index[p.name] = (p.stat().st_mtime, self._index[p.name][1])
+        return res
+
+    def put(self, key: str, res: Dict[str, Any]) -> None:
+        """Store a backend result for `key` atomically and evict older entries over budget."""
+        if self.budget_bytes <= 0:
+            return
+        entry = {
+            "text": res.get("text") or "",
+            "segments": [
+                {k: sg[k] for k in _SEGMENT_FIELDS if sg.get(k) is not None}
+                for sg in res.get("segments") or []
+            ],
+        }
+        if res.get("language"):
+            entry["language"] = res["language"]
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        p = self.path_for(key)
+        with self._lock:
+            self._load_index_locked()
+            tmp = p.with_name(p.name + ".tmp")
+            try:
+                p.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_bytes(data)
+                os.replace(tmp, p)
+            except OSError as e:
+                log.debug(f"Failed to write chunk cache entry {p}: {e}")
+                return
+            old = self._index.pop(p.name, None)
+            self._total += len(data) - (old[1] if old else 0)
+            self._index[p.name] = (p.stat().st_mtime, len(data))
+            if self._total > self.budget_bytes:
+                self._evict_locked(keep=p.name)
+
+    def _load_index_locked(self) -> None:
+        if self._index is not None:
+            return
+        self._index = {}
+        for f in self.root.glob(f"*/*{self.SUFFIX}"):
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            self._index[f.name] = (st.st_mtime, st.st_size)
+        self._total = sum(size for _, size in self._index.values())
+
+    def _evict_locked(self, keep: str) -> None:
+        # evict down to 90% of the budget so the next few stores do not evict again
+        target = int(self.budget_bytes * 0.9)
+        for name, (_, size) in sorted(self._index.items(), key=lambda e: e[1][0]):
+            if self._total <= target:
+                break
+            if name == keep:
+                continue
+            try:
+                (self.root / name[:2] / name).unlink()
+            except OSError:
+                pass
+            del self._index[name]
+            self._total -= size
+        log.debug(f"Chunk cache evicted to {self._total} bytes")
@@ -1,17 +1,36 @@
 # -*- coding: utf-8 -*-
 """Chunked transcription driver: silence chunking + thermal pacing + resume + SRT."""
 from __future__ import annotations
-from dataclasses import dataclass, asdict
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field, replace
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Any
+from typing import Callable, Deque, List, Tuple, Optional, Dict, Any
 import hashlib
+import itertools
 import json
 import math
 import threading
 import time
 import os
 
-from app.core.audio.chunker import ChunkConfig, compute_boundaries
+from app.core.audio.chunker import (
+    ChunkConfig, WHISPER_WINDOW_S, compute_boundaries, iter_boundaries, whisper_windows,
+)
+from app.core.audio.ffprobe_utils import ffprobe_info
+from app.core.audio.fingerprint import file_fingerprint
+from app.core.audio.pcm import DecodedAudio, PcmStream, decode_audio
+from app.core.audio.pcm_cache import PcmCache
+from app.core.audio.vad import SpeechMap, prune_non_speech
+from app.core.stt.backends import DEFAULT_BACKEND, SttBackend, create_backend, get_backend
+from app.core.stt.batched import ChunkBatcher
+from app.core.stt.cascade import CascadeConfig, Escalator, escalation_reason
+from app.core.stt.checkpoint import CheckpointJournal, load_journal
+from app.core.stt.chunk_cache import ChunkCache, chunk_key, model_tag
+from app.core.stt.language import detect_file_language, english_variant
+from app.core.stt.parallel import ChunkPool, get_pool, model_ram_gb, resolve_workers, shutdown_pool
+from app.core.stt.two_pass import DraftPass, TranscriptSlots
 from app.core.system.thermal import ThermalConfig, get_cpu_temp_c, get_cpu_percent
 from app.core.common.workers import WorkerSignals
 
@@ -20,50 +39,173 @@ log = logging.getLogger(__name__)
 
 import gc
 
+@dataclass
+class _CachedModel:
+    model: Any
+    nbytes: int
+    leases: int = 0
+
+
 class _ModelManager:
     """
-    Manages Whisper model lifecycle with support for dynamic model switching.
+    Keyed LRU cache of loaded models, bounded by a memory budget.
 
-    Implements aggressive GPU memory cleanup to enable switching between different
-    models without requiring app restart. Supports CUDA (NVIDIA) and MPS (Apple Silicon).
+    Models are keyed by (name, device, models_dir, quantize, backend) and loaded
+    through the backend's `load_model`. Several can stay loaded (e.g.
+    `tiny` for previews and `small` for final passes); when loading one would
+    exceed `budget_bytes`, least-recently-used models that are not leased are
+    evicted. A model's size is estimated from its parameter and buffer bytes
+    (or the per-model table for engines without torch parameters).
 
-    Uses multi-stage cleanup process including:
+    Thread-safe: `lease()` pins a model while a job uses it, concurrent requests
+    for the same key share one load, and different keys load in parallel. A
+    load's optional warm-up runs before the model is published, so no job can
+    decode on it while the warm-up does.
+
+    Eviction uses a multi-stage cleanup so GPU memory is actually returned:
     - Model migration to CPU
     - Multiple garbage collection rounds
     - GPU cache clearing (CUDA/MPS)
     - CUDA synchronization and memory statistics reset
     - MPS cache clearing for Apple Silicon devices
     """
-    def __init__(self):
-        self._key = None
-        self._model = None
-
-    def get(self, name: str, device: str, models_dir: Path):
-        key = (name, device, str(models_dir))
-        if self._key == key and self._model is not None:
-            return self._model
-
-        # Try to safely unload existing model before switching
-        if self._model is not None:
-            log.debug(f"Switching model from {self._key} to {key}, attempting to unload...")
-            success = self._unload()
-            if not success:
-                raise RuntimeError("To load the other model, please restart the App.")
-
-        # Load new model
-        import whisper  # type: ignore
-        log.info(f"Loading model: {name} on device: {device}")
-        self._model = whisper.load_model(name, device=device, download_root=str(models_dir))
-        self._key = key
-        return self._model
-
-    def _unload(self) -> bool:
+    def __init__(self, budget_bytes: int = 0):
+        self._models: "OrderedDict[Tuple[str, str, str, bool, str], _CachedModel]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks: Dict[Tuple[str, str, str, bool, str], threading.Lock] = {}
+        self.budget_bytes = budget_bytes or _default_model_budget()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def set_budget(self, budget_mb: int) -> None:
+        """Set the budget in MB (0 = default share of system RAM) and evict down to it."""
+        with self._lock:
+            self.budget_bytes = budget_mb * 1024 * 1024 if budget_mb > 0 else _default_model_budget()
+            self._evict_locked(incoming=0)
+
+    def get(self, name: str, device: str, models_dir: Path, quantize: bool = False,
+            backend: str = DEFAULT_BACKEND):
+        """Return the model without pinning it (it may be evicted by later loads)."""
+        model = self.acquire(name, device, models_dir, quantize, backend)
+        self.release(model)
+        return model
+
+    @contextmanager
+    def lease(self, name: str, device: str, models_dir: Path, quantize: bool = False,
+              backend: str = DEFAULT_BACKEND):
+        """Context manager yielding a model that cannot be evicted until exit."""
+        model = self.acquire(name, device, models_dir, quantize, backend)
+        try:
+            yield model
+        finally:
+            self.release(model)
+
+    def acquire(self, name: str, device: str, models_dir: Path, quantize: bool = False,
+                backend: str = DEFAULT_BACKEND, warm_up: Optional[Callable[[Any], None]] = None):
+        """Load (or reuse) and pin a model; pair every call with `release`.
+
+        `quantize` selects the backend's int8 variant where it has one
+        (see whisper_runner.load_quantized_model). `warm_up(model)` runs only if
+        this call loads the model, under the key's load lock: requests for the
+        same model wait for it, other models are not held up.
+        """
+        key = self._key(name, device, models_dir, quantize, backend)
+        quantize, backend = key[3], key[4]
+        hint_key = (name, quantize, backend)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                entry.leases += 1
+                self._models.move_to_end(key)
+                self.hits += 1
+                return entry.model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # another thread may have finished loading this key meanwhile
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    entry.leases += 1
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return entry.model
+                self.misses += 1
+                # make room using the size of the model last seen under this name, if any
+                self._evict_locked(incoming=_MODEL_SIZE_HINTS.get(hint_key, 0))
+
+            log.info(f"Loading {backend} model: {name} on device: {device}" + (" (int8)" if quantize else ""))
+            model = get_backend(backend).load_model(name, device, models_dir, quantize)
+            nbytes = _model_nbytes(model) or int(model_ram_gb(name) * 1024**3)
+            _MODEL_SIZE_HINTS[hint_key] = nbytes
+            if warm_up is not None:
+                try:
+                    warm_up(model)
+                except Exception as e:
+                    log.debug(f"Warm-up of {name} failed: {e}")
+
+            with self._lock:
+                self._models[key] = _CachedModel(model=model, nbytes=nbytes, leases=1)
+                self._evict_locked(incoming=0)
+                log.debug(f"Model cache: {len(self._models)} loaded, "
+                          f"{self._used_bytes() / 1024**2:.0f}/{self.budget_bytes / 1024**2:.0f} MB")
+            return model
+
+    def is_loaded(self, name: str, device: str, models_dir: Path, quantize: bool = False,
+                  backend: str = DEFAULT_BACKEND) -> bool:
+        with self._lock:
+            return self._key(name, device, models_dir, quantize, backend) in self._models
+
+    @staticmethod
+    def _key(name: str, device: str, models_dir: Path, quantize: bool, backend: str) -> Tuple[str, str, str, bool, str]:
+        backend = backend or DEFAULT_BACKEND
+        quantize = bool(quantize) and device in get_backend(backend).capabilities.quantize_devices
+        return (name, device, str(models_dir), quantize, backend)
+
+    def release(self, model) -> None:
+        with self._lock:
+            for entry in self._models.values():
+                if entry.model is model:
+                    entry.leases = max(0, entry.leases - 1)
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": [k[0] for k in self._models],
+                "used_mb": self._used_bytes() / 1024**2,
+                "budget_mb": self.budget_bytes / 1024**2,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _used_bytes(self) -> int:
+        return sum(e.nbytes for e in self._models.values())
+
+    def _evict_locked(self, incoming: int) -> None:
+        """Evict unleased models, oldest first, until `incoming` more bytes fit."""
+        for key in list(self._models):
+            if self._used_bytes() + incoming <= self.budget_bytes:
+                return
+            entry = self._models[key]
+            if entry.leases > 0:
+                continue
+            del self._models[key]
+            self.evictions += 1
+            log.debug(f"Evicting model {key} ({entry.nbytes / 1024**2:.0f} MB)")
+            self._unload(entry.model)
+        if self._used_bytes() + incoming > self.budget_bytes:
+            log.debug("Model cache over budget: remaining models are in use")
+
+    def _unload(self, model) -> bool:
         """
         Aggressively unload the model and free GPU memory.
         Supports CUDA (NVIDIA) and MPS (Apple Silicon) backends.
         Returns True if successful, False otherwise.
         """
-        if self._model is None:
+        if model is None:
             return True
 
         try:
@@ -76,16 +218,13 @@ class _ModelManager:
                 has_mps = hasattr(torch.backends, 'mps') and torch.backends.mps.is_available()
 
                 if has_cuda or has_mps:
-                    self._model.to("cpu")
+                    model.to("cpu")
                     log.debug("Model moved to CPU")
             except Exception as e:
                 log.debug(f"Failed to move model to CPU: {e}")
 
             # Step 2: Delete model and clear reference
-            model_ref = self._model
-            self._model = None
-            self._key = None
-            del model_ref
+            del model
             log.debug("Model reference deleted")
 
             # Step 3: Multiple rounds of garbage collection
@@ -152,12 +291,40 @@ class _ModelManager:
 
         except Exception as e:
             log.error(f"Failed to unload model: {e}")
-            self._model = None
-            self._key = None
             return False
 
     def close(self):
-        self._unload()
+        with self._lock:
+            for key in list(self._models):
+                self._unload(self._models.pop(key).model)
+
+
+# Last measured size per (name, quantize, backend), used to make room before a reload
+_MODEL_SIZE_HINTS: Dict[Tuple[str, bool, str], int] = {}
+
+
+def _model_nbytes(model) -> int:
+    try:
+        n = sum(t.numel() * t.element_size() for t in itertools.chain(model.parameters(), model.buffers()))
+        # packed int8 weights of dynamically quantized layers are not parameters
+        for m in model.modules():
+            packed = getattr(m, "_packed_params", None)
+            if packed is not None:
+                w, b = packed._weight_bias()
+                n += w.numel() * w.element_size() + (b.numel() * b.element_size() if b is not None else 0)
+        return n
+    except Exception:
+        return 0
+
+
+def _default_model_budget() -> int:
+    """Half of physical RAM (4 GB if unknown)."""
+    try:
+        import psutil
+        return int(psutil.virtual_memory().total * 0.5)
+    except Exception:
+        return 4 * 1024**3
+
 
 MODEL_MANAGER = _ModelManager()
 
@@ -192,6 +359,24 @@ class TranscribeOptions:
     device: str
     models_dir: Path
     include_timestamps: bool
+    # Byte budget (MB) for the decoded-PCM disk cache; 0 disables it
+    pcm_cache_mb: int = 4096
+    # Byte budget (MB) for cached per-chunk results (any job, any file); 0 disables it
+    chunk_cache_mb: int = 256
+    # Parallel CPU worker processes (one model replica each); 0 = auto from cores/model size
+    workers: int = 0
+    # Chunks encoded/decoded together in one forward pass (in-process path only)
+    batch_size: int = 1
+    # RAM budget (MB) for models kept loaded between jobs; 0 = half of system RAM
+    model_cache_mb: int = 0
+    # int8 weights where the backend supports them (Whisper: CPU only)
+    quantize: bool = False
+    # Inference engine, see backends.BACKENDS ("whisper", "faster-whisper")
+    backend: str = DEFAULT_BACKEND
+    # Fast model for a draft pass ahead of `model` (e.g. "tiny"); "" = single pass
+    draft_model: str = ""
+    # Re-decode low-confidence chunks of `model` with `cascade.model` (off if empty)
+    cascade: CascadeConfig = field(default_factory=CascadeConfig)
 
 
 @dataclass
@@ -202,6 +387,82 @@ class Progress:
     eta_secs: float
 
 
+@dataclass
+class _PendingChunk:
+    """A chunk handed to the model whose result has not been accumulated yet."""
+    index: int
+    start_s: float
+    end_s: float
+    smap: Optional[SpeechMap]
+    future: Future  # -> (whisper result, compute seconds)
+    samples: Any = None  # chunk audio, kept only while a cascade may re-decode it
+    cache_key: str = ""  # chunk cache entry to store the result under
+    cached: bool = False  # result served from the chunk cache
+
+
+@dataclass
+class WindowStats:
+    """Whisper 30 s window usage of one run, derived from the per-chunk timings.
+
+    Every chunk is padded up to a whole number of windows; the compute share of
+    that padding is estimated by splitting each chunk's time across its windows.
+    `compare` adds the other chunking mode (window-aligned or not) over the same
+    audio, priced at this run's compute per window, so the summary shows the
+    padded compute one mode avoids against the other.
+    """
+    chunks: int = 0
+    windows: int = 0
+    audio_s: float = 0.0
+    span_s: float = 0.0        # chunk lengths before non-speech pruning
+    start_s: Optional[float] = None
+    compute_s: float = 0.0
+    padded_s: float = 0.0
+    padded_compute_s: float = 0.0
+    multi_window_chunks: int = 0
+    alt_windows: int = 0       # windows of the other chunking mode (0 = not compared)
+    alt_aligned: bool = False
+
+    def add(self, fed_s: float, elapsed_s: float, start_s: float, end_s: float) -> None:
+        if fed_s <= 0:
+            return
+        n = whisper_windows(fed_s)
+        pad = n * WHISPER_WINDOW_S - fed_s
+        self.span_s += end_s - start_s
+        self.start_s = start_s if self.start_s is None else min(self.start_s, start_s)
+        self.chunks += 1
+        self.windows += n
+        self.audio_s += fed_s
+        self.compute_s += elapsed_s
+        self.padded_s += pad
+        self.padded_compute_s += elapsed_s * pad / (n * WHISPER_WINDOW_S)
+        if n > 1:
+            self.multi_window_chunks += 1
+
+    def compare(self, bounds: List[Tuple[float, float]], aligned: bool) -> None:
+        """Count the windows chunking into `bounds` (the other mode, same audio) would have run."""
+        fed_ratio = self.audio_s / max(self.span_s, 1e-6)  # share of audio left after pruning
+        self.alt_windows = sum(whisper_windows((b - a) * fed_ratio) for a, b in bounds if b > a)
+        self.alt_aligned = aligned
+
+    def summary(self) -> str:
+        share = 100.0 * self.padded_s / max(self.windows * WHISPER_WINDOW_S, 1e-6)
+        text = (
+            f"Whisper windows: {self.windows} for {self.chunks} chunks "
+            f"({self.multi_window_chunks} needed a second window); "
+            f"padding {self.padded_s:.0f}s ({share:.0f}% of window time), "
+            f"~{self.padded_compute_s:.1f}s of {self.compute_s:.1f}s compute"
+        )
+        if self.alt_windows:
+            # extra windows are padding: price them at this run's compute per window
+            diff_s = (self.alt_windows - self.windows) * self.compute_s / max(self.windows, 1)
+            if self.alt_aligned:
+                text += f"; window-aligned chunking: ~{self.alt_windows} windows ({diff_s:+.1f}s compute)"
+            else:
+                text += (f"; unaligned chunking: ~{self.alt_windows} windows, "
+                         f"~{max(diff_s, 0.0):.1f}s padded compute avoided")
+        return text
+
+
 # -------------------------
 # SRT formatting helpers
 # -------------------------
@@ -242,6 +503,23 @@ def segments_to_srt(segments: List[Dict[str, Any]]) -> str:
     return "\n".join(lines).rstrip() + "\n"
 
 
+def _srt_blocks_for_segments(segments: List[Dict[str, Any]], start_index: int) -> str:
+    """Build SRT text for a list of segments with a starting index (live streaming)."""
+    parts: List[str] = []
+    idx = start_index
+    for sg in segments:
+        st = float(sg["start"])
+        et = float(sg["end"])
+        tx = (sg.get("text") or "").strip()
+        if not tx:
+            continue
+        parts.append(
+            f"{idx}\n{_fmt_srt_time(st)} --> {_fmt_srt_time(et)}\n{tx}\n"
+        )
+        idx += 1
+    return "\n".join(parts).rstrip() + ("\n" if parts else "")
+
+
 # -------------------------
 # Checkpointing
 # -------------------------
@@ -250,30 +528,90 @@ def _checkpoint_dir() -> Path:
     return Path(base) / "VoiceTransor" / "cache" / "checkpoints"
 
 
+def _pcm_cache_dir() -> Path:
+    return _checkpoint_dir().parent / "pcm"
+
+
+def _chunk_cache_dir() -> Path:
+    return _checkpoint_dir().parent / "chunks"
+
+
 def _file_identity(audio_path: Path) -> str:
+    """Key of every per-file cache (checkpoint, boundaries, decoded PCM): the audio's content fingerprint.
+
+    Follows the recording when it is renamed, moved or copied to another machine.
+    """
+    return file_fingerprint(audio_path, _checkpoint_dir().parent / "fingerprints.json")
+
+
+def _checkpoint_path(file_id: str) -> Path:
+    d = _checkpoint_dir()
+    d.mkdir(parents=True, exist_ok=True)
+    return d / f"{file_id}.jsonl"
+
+
+def _path_identity(audio_path: Path) -> str:
+    """Per-file cache key of older versions: resolved path, size and mtime."""
     st = audio_path.stat()
     raw = f"{audio_path.resolve()}|{st.st_size}|{int(st.st_mtime)}"
     return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
 
-def _checkpoint_path(audio_path: Path) -> Path:
+def _remove_path_keyed(audio_path: Path) -> None:
+    """Delete the checkpoint (JSON document or journal) and boundaries older versions kept under the path key."""
+    d = _checkpoint_dir()
+    old = _path_identity(audio_path)
+    for p in [d / f"{old}.json", d / f"{old}.jsonl", *d.glob(f"{old}.*.bounds.json")]:
+        try:
+            p.unlink()
+        except OSError:
+            pass
+
+
+def _load_checkpoint(audio_path: Path, file_id: str) -> Optional[Dict[str, Any]]:
+    p = _checkpoint_path(file_id)
+    try:
+        _remove_path_keyed(audio_path)
+    except OSError:
+        pass
+    return load_journal(p)
+
+
+def _chunk_cfg_key(c_cfg: ChunkConfig) -> str:
+    return hashlib.sha1(json.dumps(asdict(c_cfg), sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def _boundaries_path(file_id: str, c_cfg: ChunkConfig) -> Path:
     d = _checkpoint_dir()
     d.mkdir(parents=True, exist_ok=True)
-    return d / f"{_file_identity(audio_path)}.json"
+    return d / f"{file_id}.{_chunk_cfg_key(c_cfg)}.bounds.json"
 
 
-def _load_checkpoint(audio_path: Path) -> Optional[Dict[str, Any]]:
-    p = _checkpoint_path(audio_path)
-    if p.exists():
-        try:
-            return json.loads(p.read_text(encoding="utf-8"))
-        except Exception:
-            return None
-    return None
+def _load_boundaries(file_id: str, c_cfg: ChunkConfig) -> Tuple[List[Tuple[float, float]], bool]:
+    """Return (bounds, complete) saved for this file + chunk config, or ([], False).
 
+    While streaming, only a prefix of the boundaries may have been discovered
+    before a cancel; `complete` tells whether they cover the whole file.
+    """
+    p = _boundaries_path(file_id, c_cfg)
+    if not p.exists():
+        return [], False
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+        if data.get("chunk_cfg") != asdict(c_cfg):
+            return [], False
+        bounds = [(float(a), float(b)) for a, b in data.get("bounds", [])]
+        return bounds, bool(data.get("complete")) and bool(bounds)
+    except Exception:
+        return [], False
 
-def _save_checkpoint(audio_path: Path, payload: Dict[str, Any]) -> None:
-    _checkpoint_path(audio_path).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+def _save_boundaries(file_id: str, c_cfg: ChunkConfig, bounds: List[Tuple[float, float]], complete: bool) -> None:
+    payload = {"chunk_cfg": asdict(c_cfg), "complete": complete, "bounds": [list(b) for b in bounds]}
+    try:
+        _boundaries_path(file_id, c_cfg).write_text(json.dumps(payload), encoding="utf-8")
+    except Exception as e:
+        log.debug(f"Failed to save chunk boundaries: {e}")
 
 
 # -------------------------
@@ -304,87 +642,196 @@ def transcribe_chunked(
     from app.core.common.workers import _enable_dbg
     _enable_dbg()
 
-    # --- helpers ---
-    def _fmt_srt_time(secs: float) -> str:
-        # SRT time: HH:MM:SS,mmm (rounded to milliseconds)
-        if secs < 0:
-            secs = 0.0
-        ms_total = int(round(secs * 1000.0))
-        h = ms_total // 3_600_000
-        rem = ms_total % 3_600_000
-        m = rem // 60_000
-        rem %= 60_000
-        s = rem // 1000
-        ms = rem % 1000
-        return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
-
-    def _srt_blocks_for_segments(segments: List[Dict[str, Any]], start_index: int) -> str:
-        # Build SRT text for a list of segments with a starting index
-        parts: List[str] = []
-        idx = start_index
-        for sg in segments:
-            st = float(sg["start"])
-            et = float(sg["end"])
-            tx = (sg.get("text") or "").strip()
-            if not tx:
-                continue
-            parts.append(
-                f"{idx}\n{_fmt_srt_time(st)} --> {_fmt_srt_time(et)}\n{tx}\n"
-            )
-            idx += 1
-        return "\n".join(parts).rstrip() + ("\n" if parts else "")
-
-    # --- Prepare whisper model and audio ---
-    try:
-        import whisper  # type: ignore
-    except Exception as e:
-        # Log the actual error for debugging
-        import traceback
-        error_details = traceback.format_exc()
-        raise RuntimeError(f"openai-whisper is not installed. Run: pip install openai-whisper\n\nActual error:\n{error_details}") from e
-
-    # load audio once (16k float32)
+    # Resume state: checkpoint plus the chunk boundaries saved with it. The file's
+    # identity keys all of them (and the PCM cache); it is looked up once per job.
+    file_id = _file_identity(audio_path)
+    ck = _load_checkpoint(audio_path, file_id) if resume else None
+    if ck and not _checkpoint_matches(ck, audio_path, file_id, t_opt, c_cfg, th_cfg):
+        ck = None
+    if ck and ck.get("complete") and not _same_decoding(ck, t_opt):
+        # finished with settings that decode differently: transcribe again from the start
+        ck = None
+    if ck and ck.get("complete"):
+        # finished before (maybe in the other output format): nothing to transcribe
+        final_text = _format_transcript(ck.get("text_parts", []), ck.get("segments_accum", []),
+                                        t_opt.include_timestamps)
+        total = float(ck.get("duration_s", 0.0))
+        _emit_safe(signals, "message", "Already transcribed with these settings; reusing the saved transcript")
+        _emit_safe(signals, "bootstrap_text", final_text)
+        _emit_safe(signals, "progress", 100, total, total, 0.0)
+        return final_text
+    done_until = float(ck.get("done_until_s", 0.0)) if ck else 0.0
+    known_bounds, bounds_complete = _load_boundaries(file_id, c_cfg)
+
+    # --- Prepare audio (the backend checks its own engine when it loads) ---
+    # Decode audio once (16k float32); shared with the chunker's silence analysis.
+    # Reuse the memory-mapped PCM from an earlier run when available; otherwise
+    # stream-decode so the first chunks are transcribed while ffmpeg is still
+    # working on the rest of the file (the stream also fills the PCM cache).
     _emit_safe(signals, "message", "Loading audio file...")
-    audio_np = whisper.load_audio(str(audio_path))
-    duration_s = float(audio_np.shape[-1] / 16000.0)
-    _emit_safe(signals, "message", f"Audio loaded: {duration_s:.1f} seconds")
-
-    device = _pick_device(t_opt.device)
-    # Use fp16 for CUDA and MPS (both support half precision)
-    fp16 = device in ("cuda", "mps")
-
+    pcm_cache = PcmCache(_pcm_cache_dir(), t_opt.pcm_cache_mb * 1024 * 1024) if t_opt.pcm_cache_mb > 0 else None
+    audio = pcm_cache.open(file_id) if pcm_cache else None
+    stream: Optional[PcmStream] = None
+    two_pass = bool(t_opt.draft_model) and t_opt.draft_model != t_opt.model
+    if audio is None and two_pass:
+        # both passes read the whole file at their own pace: decode it up front
+        audio = decode_audio(audio_path)
+        if pcm_cache:
+            pcm_cache.store(file_id, audio)
+    if audio is not None:
+        source = audio
+        duration_s = audio.duration_s
+        _emit_safe(signals, "message", f"Audio loaded: {duration_s:.1f} seconds")
+    else:
+        # When saved boundaries reach the resume point, nothing before it has to be
+        # decoded or analysed again: start ffmpeg there (keeping one silence length
+        # of context for the chunker). A partial decode is never cached.
+        seek_s = 0.0
+        if done_until > 0 and known_bounds and known_bounds[-1][1] >= done_until - 1e-3:
+            seek_s = max(0.0, done_until - c_cfg.min_silence_len_ms / 1000.0 - 1.0)
+        sink = pcm_cache.writer(file_id) if (pcm_cache and seek_s == 0) else None
+        stream = PcmStream(audio_path, start_s=seek_s, sink=sink)
+        source = stream
+        duration_s = _probe_duration_s(audio_path)
+        _emit_safe(signals, "message", f"Streaming audio: {duration_s:.1f} seconds")
+
+    model_name = t_opt.model
+    if t_opt.language == "en":
+        model_name = _english_model(t_opt, model_name)
+    backend = create_backend(t_opt.backend, model_name, _pick_device(t_opt.device), t_opt.models_dir, t_opt.quantize)
+    device = backend.device
+    n_workers = resolve_workers(t_opt.workers, model_name, device, t_opt.quantize) if backend.capabilities.worker_pool else 1
+    pool: Optional[ChunkPool] = None
+    draft: Optional[DraftPass] = None
+    escalator: Optional[Escalator] = None
+    journal: Optional[CheckpointJournal] = None
+    if t_opt.cascade.model and t_opt.cascade.model != model_name:
+        escalator = Escalator(t_opt.cascade, backend.name, device, t_opt.models_dir, t_opt.quantize)
     try:
-        log.debug("load whisper model ...")
-        _emit_safe(signals, "message", f"Loading Whisper model '{t_opt.model}' on {device}...")
-        # cause crash
-        # model = whisper.load_model(t_opt.model, device=device, download_root=str(t_opt.models_dir))
-        # cached model, ok
-        model = MODEL_MANAGER.get(t_opt.model, device, t_opt.models_dir)
-        log.debug("loaded whisper model ok")
-        _emit_safe(signals, "message", f"Model '{t_opt.model}' loaded successfully")
-    except Exception as e:
-        raise RuntimeError(f"Failed to load/download model: {e}") from e
+        try:
+            if n_workers > 1:
+                # each worker process loads its own replica; the GUI process holds none
+                _emit_safe(signals, "message", f"Starting {n_workers} workers with Whisper model '{model_name}'...")
+                pool = get_pool(model_name, t_opt.models_dir, n_workers, quantize=t_opt.quantize)
+            else:
+                log.debug(f"load {backend.name} model ...")
+                _emit_safe(signals, "message", f"Loading {backend.name} model '{model_name}' on {device}...")
+                # cause crash
+                # model = whisper.load_model(t_opt.model, device=device, download_root=str(t_opt.models_dir))
+                # cached model, pinned until the job ends
+                MODEL_MANAGER.set_budget(t_opt.model_cache_mb)
+                backend.load()
+                log.debug(f"loaded {backend.name} model ok; cache {MODEL_MANAGER.stats()}")
+                _emit_safe(signals, "message", f"Model '{model_name}' loaded successfully")
+        except Exception as e:
+            raise RuntimeError(f"Failed to load/download model: {e}") from e
+
+        # Auto language: detect once for the whole file instead of in every chunk
+        language = t_opt.language or None
+        if language is None:
+            language = _pin_language(backend, pool, source, done_until, duration_s, c_cfg, ck, signals)
+            if language == "en" and pool is None:
+                en_name = _english_model(t_opt, backend.model_name)
+                if en_name != backend.model_name:
+                    backend = _switch_backend(backend, en_name, t_opt, signals)
+
+        if two_pass:
+            draft = _load_draft_pass(t_opt, c_cfg, device, language, ck, signals)
+
+        journal = CheckpointJournal(_checkpoint_path(file_id))
+        journal.start(_checkpoint_header(audio_path, file_id, t_opt, c_cfg, th_cfg, duration_s, language, draft, ck), ck)
+
+        return _transcribe_source(
+            audio_path, file_id, source, audio, duration_s, backend, pool, draft, escalator, journal, language,
+            t_opt, c_cfg, th_cfg, stop_flag, signals,
+            ck, known_bounds, bounds_complete,
+        )
+    finally:
+        if draft is not None:
+            draft.stop()
+            draft.backend.close()
+        if escalator is not None:
+            escalator.close()
+        if journal is not None:
+            # waits for queued records; after the draft pass stopped, which may still record a draft
+            journal.close(compact=True)
+        backend.close()
+        if stream is not None:
+            stream.close()
+
+
+def _transcribe_source(
+    audio_path: Path,
+    file_id: str,
+    source,
+    audio: Optional[DecodedAudio],
+    duration_s: float,
+    backend: SttBackend,
+    pool: Optional[ChunkPool],
+    draft: Optional[DraftPass],
+    escalator: Optional[Escalator],
+    journal: CheckpointJournal,
+    language: Optional[str],
+    t_opt: TranscribeOptions,
+    c_cfg: ChunkConfig,
+    th_cfg: ThermalConfig,
+    stop_flag: threading.Event,
+    signals: WorkerSignals,
+    ck: Optional[Dict[str, Any]],
+    known_bounds: List[Tuple[float, float]],
+    bounds_complete: bool,
+) -> str:
+    """Chunk loop of `transcribe_chunked` over a decoded or streaming PCM source.
+
+    Chunks run on `backend` (loaded by the caller) or, for parallel CPU jobs,
+    on `pool`, in `language` (None = per-chunk detection). With `draft` (which
+    needs decoded `audio`), a draft pass shows every chunk first and refined
+    chunks replace it through `chunk_text`. With `escalator`, chunks that fail its
+    confidence thresholds are re-decoded with the cascade model. Chunks whose
+    audio was transcribed by the same model before are served from the chunk
+    cache. Every completed chunk is appended to `journal`. `ck` is a checkpoint already validated for these options (or None),
+    and `known_bounds` the boundaries saved by an earlier run (`bounds_complete`
+    if they cover the whole file).
+    """
+    device = backend.device
+    n_workers = pool.workers if pool is not None else 1
 
     # --- Determine boundaries, possibly resume ---
     def _progress_callback(msg: str):
         _emit_safe(signals, "message", msg)
 
-    bounds = compute_boundaries(audio_path, c_cfg, progress_callback=_progress_callback)
-    _emit_safe(signals, "message", f"Chunking complete: {len(bounds)} chunks created")
+    bounds: Optional[List[Tuple[float, float]]]
+    if bounds_complete:
+        # same file + chunk settings as an earlier run: skip silence analysis entirely
+        bounds = known_bounds
+        _emit_safe(signals, "message", f"Reusing {len(bounds)} saved chunk boundaries")
+        bound_iter = iter(bounds)
+    elif audio is not None:
+        bounds = compute_boundaries(audio_path, c_cfg, progress_callback=_progress_callback, audio=audio)
+        _save_boundaries(file_id, c_cfg, bounds, complete=True)
+        _emit_safe(signals, "message", f"Chunking complete: {len(bounds)} chunks created")
+        bound_iter = iter(bounds)
+    else:
+        # boundaries are discovered as the stream advances, after any saved prefix
+        bounds = None
+        start_ms = int(round(known_bounds[-1][1] * 1000)) if known_bounds else 0
+        bound_iter = itertools.chain(known_bounds, iter_boundaries(source, c_cfg, start_ms=start_ms))
+    # boundaries seen so far while streaming; saved so a resume can seek past them
+    seen_bounds: List[Tuple[float, float]] = []
     total = duration_s
 
-    ck = _load_checkpoint(audio_path) if resume else None
     done_until = 0.0
     segments_accum: List[Dict[str, Any]] = []
     text_accum_parts: List[str] = []
 
-    if ck and _checkpoint_matches(ck, audio_path, t_opt, c_cfg, th_cfg):
+    if ck:
         done_until = float(ck.get("done_until_s", 0.0))
         progress_pct = int(100.0 * done_until / total) if total > 0 else 0
         _emit_safe(signals, "message", f"Resuming from checkpoint ({progress_pct}% completed previously)...")
 
+        text_accum_parts = list(ck.get("text_parts", []))
+        segments_accum = list(ck.get("segments_accum", []))
         if t_opt.include_timestamps:
-            segments_accum = list(ck.get("segments_accum", []))
             # Bootstrap previously completed SRT into UI
             if segments_accum:
                 try:
@@ -400,109 +847,181 @@ def transcribe_chunked(
             prev_text = ck.get("text_accum", "") or ""
             if prev_text.strip():
                 _emit_safe(signals, "bootstrap_text", prev_text)
-
-        # skip completed chunks
-        cut_idx = 0
-        while cut_idx < len(bounds) and bounds[cut_idx][1] <= done_until + 1e-3:
-            cut_idx += 1
-        start_idx = cut_idx
-        _emit_safe(signals, "message", f"Skipping {start_idx} completed chunks, continuing from chunk {start_idx+1}/{len(bounds)}")
     else:
-        start_idx = 0
         _emit_safe(signals, "message", "Starting transcription from beginning...")
 
+    # Two-pass: the draft thread fills the transcript ahead, refined chunks replace it
+    slots: Optional[TranscriptSlots] = None
+    if draft is not None and bounds is not None:
+        first = next((i for i, (_, e) in enumerate(bounds) if e > done_until + 1e-3), len(bounds))
+        slots = TranscriptSlots(
+            lambda k, text: _emit_safe(signals, "chunk_text", k, text),
+            first, t_opt.include_timestamps, srt_start=len(segments_accum) + 1,
+        )
+        draft.start(source, bounds, first, slots, stop_flag, on_draft=journal.draft)
+        _emit_safe(signals, "message", f"Drafting with '{draft.backend.model_name}', refining with '{backend.model_name}'")
+
     t0 = time.time()
 
     # ETA calculation state - use moving average for accuracy
     chunk_times = []  # Track recent chunk processing times
+    chunk_lens = []   # ...and the audio seconds each of them covered
     eta_window_size = 5  # Use last 5 chunks for ETA calculation
-
-    # --- Loop over chunks ---
-    for i in range(start_idx, len(bounds)):
-        # thermal pacing before each chunk
-        _thermal_wait(th_cfg, signals, stop_flag)
-        if stop_flag.is_set():
-            _persist_checkpoint(audio_path, t_opt, c_cfg, th_cfg, total, done_until, text_accum_parts, segments_accum)
-            raise RuntimeError("__CANCELLED__")
-
-        start_s, end_s = bounds[i]
+    skipped = 0
+    pruned_s = 0.0  # non-speech audio never sent to the model
+    win_stats = WindowStats()
+    release_margin = int(c_cfg.min_silence_len_ms * source.sample_rate / 1000)
+
+    # Chunks submitted but not yet accumulated, oldest first. With a pool, up to
+    # two chunks per worker are in flight; results are still consumed in timeline
+    # order so partial_text and the checkpoint only ever advance contiguously.
+    in_flight: Deque[_PendingChunk] = deque()
+    batcher: Optional[ChunkBatcher] = None
+    if pool is not None:
+        max_in_flight = 2 * pool.workers
+        if t_opt.batch_size > 1:
+            log.debug("batch_size is ignored with parallel workers")
+    elif t_opt.batch_size > 1 and backend.capabilities.batching:
+        # a batch runs once it is full (or when its oldest chunk is needed)
+        batcher = ChunkBatcher(backend.model, t_opt.batch_size, language, device in ("cuda", "mps"))
+        max_in_flight = batcher.batch_size - 1
+    else:
+        if t_opt.batch_size > 1:
+            log.debug(f"batch_size is ignored by the {backend.name} backend")
+        max_in_flight = 0
+
+    # results by chunk content: any earlier job with the same audio + decoding + language
+    chunk_cache = ChunkCache(_chunk_cache_dir(), t_opt.chunk_cache_mb * 1024 * 1024) if t_opt.chunk_cache_mb > 0 else None
+    cache_tag = model_tag(backend.name, backend.model_name, backend.quantize, device, batched=batcher is not None)
+
+    def _submit(chunk_audio) -> Future:
+        if chunk_audio.size == 0:
+            # nothing to do if the chunk holds no speech at all
+            fut: Future = Future()
+            fut.set_result(({"text": "", "segments": []}, 0.0))
+            return fut
+        if pool is not None:
+            return pool.submit(chunk_audio, language)
+        if batcher is not None:
+            return batcher.submit(chunk_audio)
+        fut = Future()
+        t = time.time()
+        try:
+            res = backend.transcribe(chunk_audio, language)
+            fut.set_result((res, time.time() - t))
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+
+    def _cancel() -> None:
+        if batcher is not None:
+            batcher.cancel()
+        for p in in_flight:
+            p.future.cancel()
+        in_flight.clear()
+        if bounds is None:
+            _save_boundaries(file_id, c_cfg, seen_bounds, complete=False)
+        # the journal writer runs in the background: make the finished chunks durable now
+        journal.flush()
+        raise RuntimeError("__CANCELLED__")
+
+    def _complete(p: _PendingChunk) -> None:
+        nonlocal done_until, total, escalator
+        start_s, end_s, smap = p.start_s, p.end_s, p.smap
         chunk_len = end_s - start_s
-
-        # slice audio in samples
-        s_idx = int(start_s * 16000)
-        e_idx = int(end_s * 16000)
-        chunk_audio = audio_np[s_idx:e_idx]
-
-        # Track chunk processing time for accurate ETA
-        chunk_start_time = time.time()
-
-        # transcribe this chunk
+        if batcher is not None and not p.future.done():
+            batcher.flush()
         try:
-            res = model.transcribe(
-                chunk_audio,
-                language=t_opt.language or None,
-                task="transcribe",
-                fp16=fp16,
-                verbose=False,
-            )
+            res, chunk_elapsed = p.future.result()
         except Exception as e:
+            if pool is not None:
+                shutdown_pool()  # a crashed worker breaks the whole pool
             raise RuntimeError(f"Transcription failed at {start_s:.2f}s: {e}") from e
-        finally:
-            # Release chunk audio immediately after transcription
-            del chunk_audio
+        if p.cache_key:
+            chunk_cache.put(p.cache_key, res)
+
+        if escalator is not None:
+            # cascade: re-decode the chunk with the bigger model if the fast one was unsure
+            reason = escalation_reason(res, escalator.cfg) if p.samples is not None and p.samples.size else None
+            if reason:
+                t = time.time()
+                try:
+                    esc_key = chunk_key(p.samples, escalator.model_tag, language) if chunk_cache is not None else ""
+                    cached = chunk_cache.get(esc_key) if esc_key else None
+                    if cached is not None:
+                        res = cached
+                    else:
+                        res = escalator.transcribe(p.samples, language)
+                        if esc_key:
+                            chunk_cache.put(esc_key, res)
+                    chunk_elapsed += time.time() - t
+                    escalator.stats.add(chunk_len, reason, time.time() - t)
+                except Exception as e:
+                    log.warning(f"Cascade disabled, keeping '{backend.model_name}' results: {e}")
+                    escalator.close()
+                    escalator = None
+            else:
+                escalator.stats.add(chunk_len, None)
+            p.samples = None
 
         # Record chunk processing time
-        chunk_elapsed = time.time() - chunk_start_time
-        chunk_times.append(chunk_elapsed)
+        if not p.cached:
+            # a cache hit says nothing about how fast the model is
+            chunk_times.append(chunk_elapsed)
+            chunk_lens.append(chunk_len)
+        win_stats.add(smap.kept_s if smap is not None else chunk_len, chunk_elapsed, start_s, end_s)
 
         # accumulate + stream to UI
-        segs = res.get("segments") or []
+        # both forms are kept (and checkpointed) whatever is shown, so the job can
+        # later be put out in the other format without transcribing it again
+        new_segments = _absolute_segments(res.get("segments") or [], start_s, smap)
+        # plain text: prefer the model's merged text for the chunk
+        chunk_text = (res.get("text") or "").strip()
+        srt_start = len(segments_accum) + 1
+        segments_accum.extend(new_segments)
+        if chunk_text:
+            text_accum_parts.append(chunk_text)
         if t_opt.include_timestamps:
-            # convert segment times to absolute timeline for this chunk
-            new_segments: List[Dict[str, Any]] = []
-            for sg in segs:
-                st = float(start_s) + float(sg.get("start", 0.0))
-                et = float(start_s) + float(sg.get("end", 0.0))
-                tx = (sg.get("text") or "").strip()
-                if tx:
-                    new_segments.append({"start": st, "end": et, "text": tx})
-
-            if new_segments:
+            if slots is not None:
+                # replaces the chunk's draft (numbering follows the refined chunks before it)
+                slots.refine(p.index, new_segments)
+            elif new_segments:
                 # Stream SRT blocks for just-finished segments (proper numbering continues)
-                srt_chunk = _srt_blocks_for_segments(new_segments, start_index=len(segments_accum) + 1)
-                _emit_safe(signals, "partial_text", srt_chunk)
-                # Accumulate for final output & checkpoint
-                segments_accum.extend(new_segments)
+                _emit_safe(signals, "partial_text", _srt_blocks_for_segments(new_segments, start_index=srt_start))
         else:
-            # Plain text: prefer the model's merged text for the chunk
-            chunk_text = (res.get("text") or "").strip()
-            if chunk_text:
-                text_accum_parts.append(chunk_text)
+            if slots is not None:
+                slots.refine(p.index, chunk_text)
+            elif chunk_text:
                 _emit_safe(signals, "partial_text", chunk_text)
 
         done_until = end_s
+        if source.finished:
+            # streamed duration is exact once ffmpeg is done (ffprobe may be off or missing)
+            total = max(source.num_samples / float(source.sample_rate), done_until)
 
-        # persist checkpoint routinely
-        _persist_checkpoint(audio_path, t_opt, c_cfg, th_cfg, total, done_until, text_accum_parts, segments_accum)
+        # persist checkpoint routinely (one journal record, written in the background)
+        journal.chunk(start_s, end_s, total, chunk_text, new_segments)
 
         # progress & ETA calculation using moving average
-        percent = int(min(100, round(100.0 * done_until / total)))
-        remain_chunks = len(bounds) - (i + 1)
+        percent = int(min(100, round(100.0 * done_until / total))) if total > 0 else 0
+        remain_s = max(0.0, total - done_until)
 
-        # Calculate ETA based on recent chunk times (more accurate than global average)
-        if remain_chunks > 0 and chunk_times:
+        # Calculate ETA from recent processing speed (seconds of compute per second of
+        # audio, shared by the workers); works without knowing the chunk count up front
+        if remain_s > 0 and chunk_times:
             # Use last N chunks for ETA (skip first chunk if it's the only one - cold start)
             recent_times = chunk_times[-eta_window_size:] if len(chunk_times) > 1 else chunk_times
-            avg_chunk_time = sum(recent_times) / len(recent_times)
-            eta = avg_chunk_time * remain_chunks
+            recent_lens = chunk_lens[-eta_window_size:] if len(chunk_lens) > 1 else chunk_lens
+            eta = sum(recent_times) / max(sum(recent_lens), 1e-6) * remain_s / n_workers
         else:
             eta = 0.0
 
         _emit_safe(signals, "progress", percent, done_until, total, eta)
-        _emit_safe(signals, "message", f"Processed chunk {i+1}/{len(bounds)} ({chunk_len:.1f}s)")
+        skipped_note = f", {chunk_len - smap.kept_s:.1f}s non-speech skipped" if smap and smap.kept_s < chunk_len - 0.05 else ""
+        _emit_safe(signals, "message", f"Processed chunk {_chunk_label(p.index, bounds)} ({chunk_len:.1f}s{skipped_note})")
 
         # Clean GPU cache after each chunk to prevent memory accumulation
-        if (i + 1) % 2 == 0:  # Every 2 chunks
+        if (p.index + 1) % 2 == 0:  # Every 2 chunks
             try:
                 import torch
                 if device == "cuda" and torch.cuda.is_available():
@@ -512,23 +1031,110 @@ def transcribe_chunked(
             except Exception:
                 pass
 
+    # --- Loop over chunks ---
+    for i, (start_s, end_s) in enumerate(bound_iter):
+        if bounds is None:
+            seen_bounds.append((start_s, end_s))
+            if len(seen_bounds) > len(known_bounds) and len(seen_bounds) % 10 == 0:
+                _save_boundaries(file_id, c_cfg, seen_bounds, complete=False)
+
+        # skip chunks completed by a previous run
+        if end_s <= done_until + 1e-3:
+            skipped += 1
+            source.release(max(0, int(end_s * source.sample_rate) - release_margin))
+            continue
+        if skipped:
+            _emit_safe(signals, "message", f"Skipping {skipped} completed chunks, continuing from chunk {_chunk_label(i, bounds)}")
+            skipped = 0
+
+        # thermal pacing before each chunk
+        _thermal_wait(th_cfg, signals, stop_flag)
+        if stop_flag.is_set():
+            _cancel()
+
+        chunk_len = end_s - start_s
+
+        # slice audio in samples (a view for decoded audio, the rolling buffer for streams)
+        s_idx = int(start_s * source.sample_rate)
+        e_idx = int(end_s * source.sample_rate)
+        chunk_audio = source.read(s_idx, e_idx)
+        # the chunker's next look-ahead starts at most one silence length before this chunk ends
+        source.release(max(0, s_idx - release_margin))
+
+        # drop long non-speech spans; segment times are mapped back through smap
+        smap: Optional[SpeechMap] = None
+        if c_cfg.prune_silence_s > 0:
+            chunk_audio, smap = prune_non_speech(
+                chunk_audio, source.sample_rate, c_cfg.prune_silence_s,
+                c_cfg.silence_thresh_dbfs, c_cfg.prune_pad_ms,
+            )
+            pruned_s += chunk_len - smap.kept_s
+
+        # transcribe this chunk (from the chunk cache, inline, or queued on the worker pool)
+        key = chunk_key(chunk_audio, cache_tag, language) if chunk_cache is not None and chunk_audio.size else ""
+        cached = chunk_cache.get(key, chunk_len) if key else None
+        if cached is not None:
+            fut = Future()
+            fut.set_result((cached, 0.0))
+            key = ""
+        else:
+            fut = _submit(chunk_audio)
+        in_flight.append(_PendingChunk(i, start_s, end_s, smap, fut,
+                                       chunk_audio if escalator is not None else None,
+                                       cache_key=key, cached=cached is not None))
+        # Release chunk audio immediately after submission
+        del chunk_audio
+
+        while len(in_flight) > max_in_flight:
+            _complete(in_flight.popleft())
+
         # inter-chunk cooldown (base; thermal path may have waited already)
         time.sleep(0.2)
 
+    # drain the pool in order
+    while in_flight:
+        if stop_flag.is_set():
+            _cancel()
+        _complete(in_flight.popleft())
+
+    if bounds is None and seen_bounds:
+        _save_boundaries(file_id, c_cfg, seen_bounds, complete=True)
+
+    if win_stats.chunks and audio is not None:
+        # chunk the transcribed part the other way too (silence analysis only) for the summary
+        alt_cfg = replace(c_cfg, align_to_window=not c_cfg.align_to_window)
+        try:
+            alt_bounds = compute_boundaries(audio_path, alt_cfg, audio=audio)
+            win_stats.compare([(a, b) for a, b in alt_bounds if a >= win_stats.start_s - 1e-3],
+                              aligned=alt_cfg.align_to_window)
+        except Exception as e:
+            log.debug(f"Window comparison skipped: {e}")
+    if win_stats.chunks:
+        log.info(win_stats.summary())
+        _emit_safe(signals, "message", win_stats.summary())
+
+    if chunk_cache is not None and chunk_cache.stats.hits:
+        log.info(chunk_cache.stats.summary())
+        _emit_safe(signals, "message", chunk_cache.stats.summary())
+
+    if escalator is not None and escalator.stats.chunks:
+        log.info(escalator.stats.summary())
+        _emit_safe(signals, "message", escalator.stats.summary())
+
+    if pruned_s > 0:
+        log.info(f"Skipped {pruned_s:.1f}s of non-speech audio ({100.0 * pruned_s / max(total, 1e-6):.0f}%)")
+        _emit_safe(signals, "message", f"Skipped {pruned_s:.1f}s of non-speech audio")
+
+    journal.finish()
+
     # --- Build final output ---
-    if t_opt.include_timestamps:
-        final_text = segments_to_srt(segments_accum)
-    else:
-        final_text = "\n".join([p for p in text_accum_parts if p]).strip()
+    final_text = _format_transcript(text_accum_parts, segments_accum, t_opt.include_timestamps)
 
     log.debug("final_text")
     log.debug(final_text)
 
-    # --- Cleanup: Release GPU memory and audio data ---
+    # --- Cleanup: Release GPU memory ---
     try:
-        # Delete audio numpy array to free memory
-        del audio_np
-
         # Force GPU memory cleanup if using CUDA or MPS
         import torch
         if device == "cuda" and torch.cuda.is_available():
@@ -550,6 +1156,109 @@ def transcribe_chunked(
 # -------------------------
 # Helpers
 # -------------------------
+def _format_transcript(text_parts: List[str], segments: List[Dict[str, Any]], include_timestamps: bool) -> str:
+    """The transcript as SRT or plain text; both are derived from what every chunk keeps."""
+    if include_timestamps:
+        return segments_to_srt(segments)
+    return "\n".join([p for p in text_parts if p]).strip()
+
+
+def _absolute_segments(segs: List[Dict[str, Any]], start_s: float,
+                       smap: Optional[SpeechMap]) -> List[Dict[str, Any]]:
+    """Chunk-relative segments (on pruned audio if `smap`) -> non-empty segments on the file timeline."""
+    out: List[Dict[str, Any]] = []
+    for sg in segs:
+        st = float(sg.get("start", 0.0))
+        et = float(sg.get("end", 0.0))
+        if smap is not None:
+            st, et = smap.to_original(st), smap.to_original(et, is_end=True)
+        tx = (sg.get("text") or "").strip()
+        if tx:
+            out.append({"start": st + float(start_s), "end": et + float(start_s), "text": tx})
+    return out
+
+
+def _load_draft_pass(t_opt: TranscribeOptions, c_cfg: ChunkConfig, device: str, language: Optional[str],
+                     ck: Optional[Dict[str, Any]], signals: WorkerSignals) -> Optional[DraftPass]:
+    """Load the draft model next to the main one; None (single pass) if that fails."""
+    name = _english_model(t_opt, t_opt.draft_model) if language == "en" else t_opt.draft_model
+    try:
+        draft_backend = create_backend(t_opt.backend, name, device, t_opt.models_dir, t_opt.quantize)
+        if not draft_backend.is_model_cached(name, t_opt.models_dir):
+            _emit_safe(signals, "message", f"Draft model '{name}' is not downloaded yet; single pass only")
+            return None
+        _emit_safe(signals, "message", f"Loading draft model '{name}'...")
+        draft_backend.load()
+    except Exception as e:
+        log.warning(f"Draft model '{name}' unavailable, single pass only: {e}")
+        return None
+    stored = None
+    if ck and ck.get("draft_model") == t_opt.draft_model \
+            and bool(ck.get("with_timestamps")) == bool(t_opt.include_timestamps):
+        stored = ck.get("drafts")
+    return DraftPass(draft_backend, c_cfg, language=language,
+                     include_timestamps=t_opt.include_timestamps, stored=stored)
+
+
+def _english_model(t_opt: TranscribeOptions, model_name: str) -> str:
+    """The English-only variant of `model_name` if it is downloaded, else `model_name`."""
+    en_name = english_variant(model_name)
+    if en_name and get_backend(t_opt.backend).is_model_cached(en_name, t_opt.models_dir):
+        log.info(f"English audio: using English-only model '{en_name}'")
+        return en_name
+    return model_name
+
+
+def _pin_language(backend: SttBackend, pool: Optional[ChunkPool], source, start_s: float, duration_s: float,
+                  c_cfg: ChunkConfig, ck: Optional[Dict[str, Any]], signals: WorkerSignals) -> Optional[str]:
+    """Language for every chunk of an auto-language job, or None to leave detection to each chunk."""
+    if ck and ck.get("detected_language"):
+        _emit_safe(signals, "message", f"Language: {ck['detected_language']} (detected earlier)")
+        return str(ck["detected_language"])
+    if pool is None and not backend.capabilities.language_detection:
+        return None
+    _emit_safe(signals, "message", "Detecting language...")
+    detect = pool.detect_language if pool is not None else backend.detect_language
+    try:
+        guess = detect_file_language(detect, source, start_s, duration_s, c_cfg.silence_thresh_dbfs)
+    except Exception as e:
+        log.warning(f"Language detection failed, detecting per chunk: {e}")
+        return None
+    if guess is None:
+        return None
+    _emit_safe(signals, "message", f"Language: {guess.language} (confidence {guess.confidence:.0%})")
+    return guess.language
+
+
+def _switch_backend(backend: SttBackend, model_name: str, t_opt: TranscribeOptions,
+                    signals: WorkerSignals) -> SttBackend:
+    """Load `model_name` on the same engine and device and release `backend`; keeps `backend` on failure."""
+    other = create_backend(backend.name, model_name, backend.device, t_opt.models_dir, t_opt.quantize)
+    try:
+        _emit_safe(signals, "message", f"Loading {backend.name} model '{model_name}' on {backend.device}...")
+        other.load()
+    except Exception as e:
+        log.warning(f"Could not load '{model_name}', keeping '{backend.model_name}': {e}")
+        return backend
+    backend.close()
+    return other
+
+
+def _chunk_label(i: int, bounds: Optional[List[Tuple[float, float]]]) -> str:
+    """'3/42' when the chunk count is known, '3' while streaming."""
+    return f"{i+1}/{len(bounds)}" if bounds is not None else f"{i+1}"
+
+
+def _probe_duration_s(audio_path: Path) -> float:
+    """Container duration via ffprobe (0.0 if unknown); used for progress while streaming."""
+    try:
+        fmt = ffprobe_info(audio_path).get("format", {}) or {}
+        return float(fmt.get("duration") or 0.0)
+    except Exception as e:
+        log.debug(f"ffprobe duration unavailable: {e}")
+        return 0.0
+
+
 def _pick_device(choice: str) -> str:
     """
     Select the appropriate device for Whisper model.
@@ -577,58 +1286,76 @@ def _pick_device(choice: str) -> str:
     return "cpu"
 
 
-def _checkpoint_matches(ck: Dict[str, Any], audio_path: Path,
+def _checkpoint_matches(ck: Dict[str, Any], audio_path: Path, file_id: str,
                         t_opt: TranscribeOptions, c_cfg: ChunkConfig, th_cfg: ThermalConfig) -> bool:
     """Whether checkpoint belongs to the same file/options."""
     try:
-        st = audio_path.stat()
-        if ck.get("audio_path") != str(audio_path) or int(ck.get("size", -1)) != st.st_size or int(ck.get("mtime", -1)) != int(st.st_mtime):
+        # same content, wherever the file lives now (path and mtime are informational)
+        if ck.get("fingerprint") != file_id or int(ck.get("size", -1)) != audio_path.stat().st_size:
+            return False
+        if ck.get("model") != t_opt.model or ck.get("language") != (t_opt.language or ""):
+            return False
+        # the engine, its weights and the cascade all change the text: never mix them in one transcript
+        if ck.get("backend", DEFAULT_BACKEND) != get_backend(t_opt.backend).name \
+                or bool(ck.get("quantize", False)) != bool(t_opt.quantize) \
+                or ck.get("cascade", asdict(CascadeConfig())) != asdict(t_opt.cascade):
             return False
-        if ck.get("model") != t_opt.model or ck.get("language") != (t_opt.language or "") or bool(ck.get("with_timestamps")) != bool(t_opt.include_timestamps):
+        # either output format can be built from a checkpoint that keeps segments for every chunk
+        if not ck.get("all_segments") and bool(ck.get("with_timestamps")) != bool(t_opt.include_timestamps):
             return False
-        # chunking knobs match the essentials
-        cc = ck.get("chunk_cfg", {})
-        if abs(float(cc.get("target_s", 30.0)) - float(c_cfg.target_s)) > 1e-3:
+        # chunking knobs must match exactly, or the saved boundaries do not line up
+        if ck.get("chunk_cfg") != asdict(c_cfg):
             return False
         return True
     except Exception:
         return False
 
 
-def _persist_checkpoint(audio_path: Path, t_opt: TranscribeOptions, c_cfg: ChunkConfig, th_cfg: ThermalConfig,
-                        total: float, done_until: float,
-                        text_parts: List[str], segments: List[Dict[str, Any]]) -> None:
+def _same_decoding(ck: Dict[str, Any], t_opt: TranscribeOptions) -> bool:
+    """Whether a finished checkpoint (already matching) was decoded exactly as `t_opt` would decode it.
+
+    Stricter than _checkpoint_matches: a resume tolerates a different device or
+    batch size, but returning a finished transcript as is does not (fp16 and
+    batched greedy decoding do not produce the same text).
+    """
+    return ck.get("device") == t_opt.device and int(ck.get("batch_size", 1)) == int(t_opt.batch_size)
+
+
+def _checkpoint_header(audio_path: Path, file_id: str, t_opt: TranscribeOptions, c_cfg: ChunkConfig,
+                       th_cfg: ThermalConfig, total: float, language: Optional[str], draft: Optional[DraftPass],
+                       ck: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Job identity and options stored in the journal header (see _checkpoint_matches)."""
     st = audio_path.stat()
-    payload = {
+    header = {
         "audio_path": str(audio_path),
+        "fingerprint": file_id,
         "size": st.st_size,
         "mtime": int(st.st_mtime),
         "duration_s": total,
         "model": t_opt.model,
         "language": t_opt.language or "",
         "device": t_opt.device,
-        "with_timestamps": t_opt.include_timestamps,
-        "chunk_cfg": {
-            "target_s": c_cfg.target_s,
-            "search_window_s": c_cfg.search_window_s,
-            "min_chunk_s": c_cfg.min_chunk_s,
-            "max_chunk_s": c_cfg.max_chunk_s,
-            "min_silence_len_ms": c_cfg.min_silence_len_ms,
-            "silence_thresh_dbfs": c_cfg.silence_thresh_dbfs,
-        },
+        "batch_size": t_opt.batch_size,
+        "backend": get_backend(t_opt.backend).name,
+        "quantize": bool(t_opt.quantize),
+        "cascade": asdict(t_opt.cascade),
+        "with_timestamps": t_opt.include_timestamps,  # format of the drafts
+        # chunks of older checkpoints kept only the format they were made in
+        "all_segments": ck is None or bool(ck.get("all_segments")),
+        "chunk_cfg": asdict(c_cfg),
         "thermal_cfg": {
             "enabled": th_cfg.enabled,
             "high_c": th_cfg.high_c,
             "critical_c": th_cfg.critical_c,
         },
-        "done_until_s": done_until,
     }
-    if segments:
-        payload["segments_accum"] = segments
-    if text_parts:
-        payload["text_accum"] = "\n".join([p for p in text_parts if p]).strip()
-
-    _save_checkpoint(audio_path, payload)
+    if language and not t_opt.language:
+        # pinned by file-level detection; a resumed job keeps it
+        header["detected_language"] = language
+    if draft is not None:
+        # drafts recorded in the journal are shown again on resume
+        header["draft_model"] = t_opt.draft_model
+    return header
 
 
 def _thermal_wait(th: ThermalConfig, signals: WorkerSignals, stop_flag: threading.Event) -> None:
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""Out-of-process inference engine: Whisper runs in a persistent child process, not the GUI."""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Optional, Tuple
+import multiprocessing as mp
+import os
+import queue
+import sys
+import threading
+
+import logging
+log = logging.getLogger(__name__)
+
+
+# -------------------------
+# Engine process side
+# -------------------------
+class _QueueSignal:
+    def __init__(self, events, job: int, name: str) -> None:
+        self._events = events
+        self._job = job
+        self._name = name
+
+    def emit(self, *args) -> None:
+        self._events.put((self._job, "signal", (self._name, args)))
+
+
+class _QueueSignals:
+    """Duck-typed WorkerSignals: every `<name>.emit(*args)` is forwarded to the GUI process."""
+
+    def __init__(self, events, job: int) -> None:
+        self._events = events
+        self._job = job
+
+    def __getattr__(self, name: str) -> _QueueSignal:
+        return _QueueSignal(self._events, self._job, name)
+
+
+def _setup_engine_logging() -> None:
+    level = getattr(logging, os.getenv("VOICETRANSOR_LOG_LEVEL", "INFO").upper(), logging.INFO)
+    if sys.stderr is None:
+        # frozen GUI build: no console to write to
+        log_dir = Path.home() / ".voicetransor" / "logs"
+        log_dir.mkdir(parents=True, exist_ok=True)
+        handler: logging.Handler = logging.FileHandler(log_dir / "engine.log", encoding="utf-8")
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(
+        "%(asctime)s [%(levelname)s] engine %(name)s:%(lineno)d - %(message)s", datefmt="%H:%M:%S"
+    ))
+    logging.basicConfig(level=level, handlers=[handler])
+
+
+def _engine_main(commands, events, cancel) -> None:
+    """Command loop of the engine process; models stay loaded between jobs."""
+    _setup_engine_logging()
+    from app.core.stt.chunked_transcriber import MODEL_MANAGER, transcribe_chunked
+    from app.core.stt.parallel import shutdown_pool
+    from app.core.stt.preload import preload_model
+
+    log.info(f"Inference engine started (pid {os.getpid()})")
+    while True:
+        msg = commands.get()
+        if msg is None:
+            break
+        job, kind, args = msg
+        try:
+            if kind == "transcribe":
+                audio_path, t_opt, c_cfg, th_cfg, resume = args
+                res = transcribe_chunked(audio_path, t_opt, c_cfg, th_cfg,
+                                         stop_flag=cancel, signals=_QueueSignals(events, job), resume=resume)
+            elif kind == "preload":
+                res = preload_model(*args)
+            else:
+                raise RuntimeError(f"Unknown engine command: {kind}")
+            events.put((job, "result", res))
+        except Exception as e:
+            events.put((job, "error", str(e)))
+
+    shutdown_pool()
+    MODEL_MANAGER.close()
+    log.info("Inference engine stopped")
+
+
+# -------------------------
+# GUI process side
+# -------------------------
+class InferenceEngine:
+    """Proxy that runs transcription jobs in a persistent spawned child process.
+
+    `transcribe` has the same signature as `transcribe_chunked` and blocks the
+    calling (pool) thread while it relays the child's message/progress/
+    partial_text/bootstrap_text events to `signals`; setting `stop_flag` is
+    forwarded as a cancel, also while the command waits for its turn (commands
+    run one at a time, a preload may be ahead of it). The GUI process never
+    imports torch, and `restart()` frees every loaded model by replacing the
+    process.
+    """
+
+    def __init__(self) -> None:
+        self._ctx = mp.get_context("spawn")
+        self._proc = None
+        self._commands = None
+        self._events = None
+        self._cancel = None
+        self._lock = threading.Lock()
+        self._job = 0
+
+    def _ensure_started(self) -> None:
+        if self._proc is not None and self._proc.is_alive():
+            return
+        self._commands = self._ctx.Queue()
+        self._events = self._ctx.Queue()
+        self._cancel = self._ctx.Event()
+        # not a daemon: the engine starts its own worker pool for parallel CPU jobs
+        self._proc = self._ctx.Process(
+            target=_engine_main, args=(self._commands, self._events, self._cancel),
+            name="VoiceTransor-engine",
+        )
+        self._proc.start()
+        log.debug(f"Started inference engine process (pid {self._proc.pid})")
+
+    def transcribe(self, audio_path: Path, t_opt, c_cfg, th_cfg,
+                   stop_flag: threading.Event, signals, resume: bool = True) -> str:
+        return self._call("transcribe", (audio_path, t_opt, c_cfg, th_cfg, resume), signals, stop_flag)
+
+    def preload(self, name: str, device_choice: str, models_dir: Path, workers: int = 0,
+                quantize: bool = False, backend: str = "") -> str:
+        return self._call("preload", (name, device_choice, models_dir, workers, quantize, backend), None, None)
+
+    def _call(self, kind: str, args: Tuple[Any, ...], signals, stop_flag: Optional[threading.Event]):
+        from app.core.stt.chunked_transcriber import _emit_safe
+
+        # an earlier command (e.g. the preload started when the dialog opened) may
+        # run for a while: stay cancellable while queued behind it
+        while not self._lock.acquire(timeout=0.1):
+            if stop_flag is not None and stop_flag.is_set():
+                raise RuntimeError("__CANCELLED__")
+        try:
+            self._ensure_started()
+            # locals: close() may drop the process from another thread meanwhile
+            proc, events, cancel = self._proc, self._events, self._cancel
+            self._job += 1
+            job = self._job
+            cancel.clear()
+            self._commands.put((job, kind, args))
+            while True:
+                if stop_flag is not None and stop_flag.is_set():
+                    cancel.set()
+                try:
+                    ev_job, what, payload = events.get(timeout=0.1)
+                except queue.Empty:
+                    if not proc.is_alive():
+                        if self._proc is proc:
+                            self._proc = None
+                        raise RuntimeError(f"Inference engine stopped unexpectedly (exit code {proc.exitcode})")
+                    continue
+                if ev_job != job:
+                    continue  # late event of an earlier, abandoned command
+                if what == "signal":
+                    if signals is not None:
+                        name, sig_args = payload
+                        _emit_safe(signals, name, *sig_args)
+                elif what == "result":
+                    return payload
+                else:
+                    raise RuntimeError(payload)
+        finally:
+            self._lock.release()
+
+    def restart(self) -> None:
+        """Drop the engine process (and every model in it); the next command starts a fresh one."""
+        self.close()
+
+    def close(self, timeout: float = 5.0) -> None:
+        proc = self._proc
+        if proc is None:
+            return
+        self._proc = None
+        try:
+            self._cancel.set()
+            self._commands.put(None)
+            proc.join(timeout)
+        except Exception:
+            pass
+        if proc.is_alive():
+            log.debug("Inference engine did not stop in time; terminating")
+            proc.terminate()
+            proc.join(timeout)
+
+
+ENGINE = InferenceEngine()
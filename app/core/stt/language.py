@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""File-level spoken-language detection: decide the language once and pin it for every chunk."""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.audio.vad import prune_non_speech
+
+import logging
+log = logging.getLogger(__name__)
+
+PROBE_WINDOW_S = 30.0        # one Whisper input window per probe
+PROBE_CANDIDATES = 12        # windows considered across a fully decoded file
+PROBE_STREAM_CANDIDATES = 4  # ...or at the head of a stream (nothing later is decoded yet)
+PROBE_COUNT = 3              # most speech-dense candidates actually run through the model
+MIN_CONFIDENCE = 0.5         # below this the language is not pinned
+MIN_SPEECH_S = 2.0           # candidates with less speech are not worth a probe
+
+# Model sizes that also come as an English-only checkpoint ("small" -> "small.en")
+_ENGLISH_VARIANTS = {"tiny", "base", "small", "medium"}
+
+
+@dataclass
+class LanguageGuess:
+    language: str
+    confidence: float
+    probes: int
+
+
+def _candidate_windows(source, start_s: float, duration_s: float) -> List[Tuple[float, float]]:
+    """30 s windows to choose probes from: spread over the file, or the stream's head."""
+    sr = source.sample_rate
+    if source.finished:
+        end_s = source.num_samples / float(sr)
+        count = PROBE_CANDIDATES
+    else:
+        end_s = start_s + PROBE_STREAM_CANDIDATES * PROBE_WINDOW_S
+        if duration_s > 0:
+            end_s = min(end_s, duration_s)
+        count = PROBE_STREAM_CANDIDATES
+    span = end_s - start_s
+    if span <= PROBE_WINDOW_S:
+        return [(start_s, end_s)] if span > 0 else []
+    count = min(count, int(span // PROBE_WINDOW_S))
+    step = (span - PROBE_WINDOW_S) / max(count - 1, 1)
+    return [(start_s + i * step, start_s + i * step + PROBE_WINDOW_S) for i in range(count)]
+
+
+def detect_file_language(
+    detect: Callable[[np.ndarray], Dict[str, float]],
+    source,
+    start_s: float,
+    duration_s: float,
+    silence_thresh_dbfs: float,
+) -> Optional[LanguageGuess]:
+    """Detect the language of `source` from a few speech-dense windows after `start_s`.
+
+    Candidate windows are ranked by how much speech they keep after non-speech
+    pruning; the densest PROBE_COUNT (speech only) go through `detect`, which
+    returns language probabilities for up to 30 s of audio. Probabilities are
+    averaged, weighted by each probe's speech seconds. Returns None if there is
+    no usable speech or the winner is below MIN_CONFIDENCE.
+    """
+    sr = source.sample_rate
+    ranked: List[Tuple[float, np.ndarray]] = []
+    for a, b in _candidate_windows(source, start_s, duration_s):
+        window = source.read(int(a * sr), int(b * sr))
+        speech, smap = prune_non_speech(window, sr, 0.5, silence_thresh_dbfs, pad_ms=100)
+        if smap.kept_s >= MIN_SPEECH_S:
+            ranked.append((smap.kept_s, np.array(speech, dtype=np.float32)))
+    if not ranked:
+        log.debug("Language detection: no speech found in the probe windows")
+        return None
+    ranked.sort(key=lambda r: r[0], reverse=True)
+
+    totals: Dict[str, float] = {}
+    weight = 0.0
+    probes = ranked[:PROBE_COUNT]
+    for kept_s, speech in probes:
+        for lang, p in detect(speech).items():
+            totals[lang] = totals.get(lang, 0.0) + kept_s * float(p)
+        weight += kept_s
+    language, score = max(totals.items(), key=lambda kv: kv[1])
+    guess = LanguageGuess(language=language, confidence=score / weight, probes=len(probes))
+    log.info(f"Detected language '{guess.language}' (confidence {guess.confidence:.2f}, {guess.probes} probes)")
+    if guess.confidence < MIN_CONFIDENCE:
+        log.info("Language confidence too low; detecting per chunk instead")
+        return None
+    return guess
+
+
+def english_variant(model_name: str) -> Optional[str]:
+    """English-only counterpart of a multilingual model name ("base" -> "base.en"), if one exists."""
+    if model_name in _ENGLISH_VARIANTS:
+        return f"{model_name}.en"
+    return None
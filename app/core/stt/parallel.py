@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""Process pool for CPU transcription: one Whisper replica per worker process."""
+from __future__ import annotations
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import multiprocessing as mp
+import os
+import threading
+import time
+
+import numpy as np
+
+import logging
+log = logging.getLogger(__name__)
+
+# Rough resident size (GB) of one fp32 CPU replica while decoding
+_MODEL_RAM_GB = {"tiny": 1.0, "base": 1.0, "small": 2.0, "medium": 5.0, "large": 10.0, "turbo": 6.0}
+# torch intra-op threads per worker; Whisper's matmuls scale poorly beyond this
+THREADS_PER_WORKER = 4
+
+
+def model_ram_gb(model_name: str) -> float:
+    """Approximate RAM of one replica of `model_name` ("small.en", "large-v3", ...)."""
+    base = model_name.split(".")[0].split("-")[0]
+    return _MODEL_RAM_GB.get(base, 2.0)
+
+
+def default_workers(model_name: str) -> int:
+    """Workers that fit both the cores (THREADS_PER_WORKER each) and ~80% of free RAM."""
+    by_cpu = (os.cpu_count() or 1) // THREADS_PER_WORKER
+    try:
+        import psutil
+        avail_gb = psutil.virtual_memory().available / 1024**3
+        by_ram = int(avail_gb * 0.8 // model_ram_gb(model_name))
+    except Exception:
+        by_ram = by_cpu
+    return max(1, min(by_cpu, by_ram))
+
+
+def resolve_workers(requested: int, model_name: str, device: str, quantize: bool = False) -> int:
+    """Worker count for a job: `requested` if > 0, else derived from cores and model size.
+
+    Only CPU jobs are parallelized; replicas on one GPU would just contend for it.
+    In auto mode a live pool for the same model is kept at its size: the RAM its
+    replicas hold is missing from "available", so sizing again would come out
+    smaller and replace a warmed pool (or load an extra in-process copy).
+    """
+    if device != "cpu":
+        return 1
+    if requested > 0:
+        return int(requested)
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL.key[0] == model_name and _POOL.key[3] == bool(quantize):
+            return _POOL.workers
+    return default_workers(model_name)
+
+
+# -------------------------
+# Worker process side
+# -------------------------
+_worker_model = None
+
+
+def _init_worker(model_name: str, models_dir: str, threads: int, quantize: bool) -> None:
+    global _worker_model
+    import torch  # type: ignore
+    from app.core.stt.whisper_runner import load_whisper_model
+    torch.set_num_threads(threads)
+    _worker_model = load_whisper_model(model_name, "cpu", Path(models_dir), quantize=quantize)
+
+
+def _warm_worker() -> int:
+    from app.core.stt.preload import warm_up
+    warm_up(_worker_model, fp16=False)
+    return os.getpid()
+
+
+def _transcribe_in_worker(samples: np.ndarray, language: Optional[str]) -> Tuple[Dict[str, Any], float]:
+    """Transcribe one chunk; returns (whisper result, compute seconds)."""
+    t = time.time()
+    res = _worker_model.transcribe(samples, language=language, task="transcribe", fp16=False, verbose=False)
+    return {"text": res.get("text", ""), "segments": res.get("segments") or []}, time.time() - t
+
+
+def _detect_in_worker(samples: np.ndarray) -> Dict[str, float]:
+    from app.core.stt.whisper_runner import detect_language
+    return detect_language(_worker_model, samples, fp16=False)
+
+
+# -------------------------
+# Pool
+# -------------------------
+class ChunkPool:
+    """`workers` processes, each loading the model once in its initializer.
+
+    Uses the spawn start method so workers never inherit the GUI's Qt/torch
+    state. Results come back as futures; callers reassemble them in order.
+    """
+
+    def __init__(self, model_name: str, models_dir: Path, workers: int, quantize: bool = False,
+                 threads_per_worker: int = THREADS_PER_WORKER) -> None:
+        self.key = (model_name, str(models_dir), int(workers), bool(quantize))
+        self.workers = int(workers)
+        self._ex = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, str(models_dir), int(threads_per_worker), bool(quantize)),
+        )
+        log.info(f"Started {self.workers} transcription workers for model '{model_name}' "
+                 f"({threads_per_worker} threads each)")
+
+    def submit(self, samples: np.ndarray, language: Optional[str]) -> Future:
+        # a plain contiguous copy: memmap views and stream buffers must not be pickled lazily
+        return self._ex.submit(_transcribe_in_worker, np.ascontiguousarray(samples, dtype=np.float32), language)
+
+    def detect_language(self, samples: np.ndarray) -> Dict[str, float]:
+        """Language probabilities for `samples`, computed on one of the workers."""
+        return self._ex.submit(_detect_in_worker, np.ascontiguousarray(samples, dtype=np.float32)).result()
+
+    def warm(self) -> None:
+        """Start the workers (each loads its model) and run a warm-up inference per worker slot."""
+        pids = {f.result() for f in [self._ex.submit(_warm_worker) for _ in range(self.workers)]}
+        log.debug(f"Warmed {len(pids)} of {self.workers} workers")
+
+    def close(self) -> None:
+        self._ex.shutdown(wait=False, cancel_futures=True)
+
+
+_POOL: Optional[ChunkPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool(model_name: str, models_dir: Path, workers: int, quantize: bool = False) -> ChunkPool:
+    """Shared pool for these settings; the workers (and their models) outlive a job."""
+    global _POOL
+    with _POOL_LOCK:
+        key = (model_name, str(models_dir), int(workers), bool(quantize))
+        if _POOL is not None and _POOL.key == key:
+            return _POOL
+        if _POOL is not None:
+            _POOL.close()
+        _POOL = ChunkPool(model_name, models_dir, workers, quantize)
+        return _POOL
+
+
+def shutdown_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close()
+            _POOL = None
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Background model preloading: load + warm up the last-used model before a job asks for it."""
+from __future__ import annotations
+from pathlib import Path
+import time
+
+import logging
+log = logging.getLogger(__name__)
+
+
+def warm_up(model, fp16: bool) -> None:
+    """One short greedy decode on silence, so the first real chunk skips kernel/allocator warm-up."""
+    import numpy as np
+    import torch  # type: ignore
+    import whisper  # type: ignore
+    from whisper.audio import N_SAMPLES, log_mel_spectrogram, pad_or_trim  # type: ignore
+
+    mel = pad_or_trim(log_mel_spectrogram(np.zeros(N_SAMPLES, dtype=np.float32), model.dims.n_mels))
+    mel = mel.to(model.device).to(torch.float16 if fp16 else torch.float32)
+    options = whisper.DecodingOptions(language="en", fp16=fp16, without_timestamps=True, sample_len=4)
+    with torch.no_grad():
+        whisper.decode(model, mel, options)
+
+
+def preload_model(name: str, device_choice: str, models_dir: Path, workers: int = 0,
+                  quantize: bool = False, backend: str = "") -> str:
+    """Load `name` where the next job will use it and run one warm-up inference.
+
+    In-process jobs get the model in MODEL_MANAGER (a job asking for it while it
+    is still loading or warming up waits for this load instead of starting
+    another; whisper's kv-cache hooks are installed on the model itself, so the
+    two must never decode on it at the same time); parallel
+    CPU jobs get the worker pool started and every worker warmed. Returns a
+    short status line for the UI. Only models already on disk are preloaded.
+    """
+    from app.core.stt.backends import create_backend
+    from app.core.stt.chunked_transcriber import MODEL_MANAGER, _pick_device
+    from app.core.stt.parallel import get_pool, resolve_workers
+
+    models_dir = Path(models_dir)
+    stt = create_backend(backend, name, _pick_device(device_choice), models_dir, quantize)
+    if not stt.is_model_cached(name, models_dir):
+        return f"Model '{name}' is not downloaded yet; not preloading"
+
+    device = stt.device
+    n_workers = resolve_workers(workers, name, device, quantize) if stt.capabilities.worker_pool else 1
+    t = time.time()
+    if n_workers > 1:
+        get_pool(name, models_dir, n_workers, quantize).warm()
+    else:
+        if MODEL_MANAGER.is_loaded(name, device, models_dir, stt.quantize, stt.name):
+            return f"Model '{name}' ready"
+        stt.load(warm_up=True)
+        stt.close()
+    log.info(f"Preloaded model '{name}' on {device} in {time.time() - t:.1f}s")
+    return f"Model '{name}' ready"
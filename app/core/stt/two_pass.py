@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Two-pass transcription: a fast draft model runs ahead, the chosen model refines chunks in place."""
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+
+import numpy as np
+
+from app.core.audio.chunker import ChunkConfig
+from app.core.audio.vad import prune_non_speech
+from app.core.stt.backends import SttBackend
+
+import logging
+log = logging.getLogger(__name__)
+
+# Chunk content: plain text, or absolute-time segments when timestamps are on
+Content = Any
+
+
+def _chunk_key(start_s: float, end_s: float) -> Tuple[float, float]:
+    return (round(float(start_s), 3), round(float(end_s), 3))
+
+
+class TranscriptSlots:
+    """The transcript as shown in the UI: one slot per chunk of this run, in timeline order.
+
+    Slot k holds chunk `first + k`. Its text is sent with `chunk_text(k, text)`,
+    first as a draft and again once refined; the UI inserts a new slot or
+    replaces the earlier text. Slots are always filled in order: a draft for a
+    chunk the refinement already reached is dropped. SRT numbers continue from
+    the previous slot, so draft numbering is corrected as refinement catches up.
+    """
+
+    def __init__(self, emit: Callable[[int, str], None], first: int, include_timestamps: bool,
+                 srt_start: int = 1) -> None:
+        self._emit = emit
+        self._first = first
+        self._timestamps = include_timestamps
+        self._lock = threading.Lock()
+        self._next = first                    # chunks before this have been shown
+        self._srt_next: Dict[int, int] = {first - 1: srt_start}
+
+    def pending(self, index: int) -> bool:
+        """Whether chunk `index` has not been shown yet (a draft for it is still useful)."""
+        with self._lock:
+            return index >= self._next
+
+    def draft(self, index: int, content: Content) -> bool:
+        with self._lock:
+            if index < self._next:
+                return False  # refinement got there first
+            self._show(index, content)
+            return True
+
+    def refine(self, index: int, content: Content) -> None:
+        with self._lock:
+            self._show(index, content)
+
+    def _show(self, index: int, content: Content) -> None:
+        from app.core.stt.chunked_transcriber import _srt_blocks_for_segments
+        start_no = self._srt_next.get(index - 1, 1)
+        if self._timestamps:
+            segs = [s for s in (content or []) if (s.get("text") or "").strip()]
+            text = _srt_blocks_for_segments(segs, start_index=start_no)
+            self._srt_next[index] = start_no + len(segs)
+        else:
+            text = content or ""
+        self._next = max(self._next, index + 1)
+        self._emit(index - self._first, text)
+
+
+class DraftPass:
+    """Background thread running the draft model over the chunks ahead of the refinement.
+
+    Drafts are shown through `TranscriptSlots` and handed to `on_draft` so the
+    checkpoint can store them; drafts restored from a checkpoint are shown
+    again without running the model. Errors stop the draft pass only.
+    """
+
+    def __init__(self, backend: SttBackend, c_cfg: ChunkConfig, language: Optional[str],
+                 include_timestamps: bool, stored: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.backend = backend
+        self._c_cfg = c_cfg
+        self._language = language
+        self._timestamps = include_timestamps
+        self._results: Dict[Tuple[float, float], Content] = {
+            _chunk_key(d["start"], d["end"]): d.get("content") for d in (stored or [])
+        }
+        self._results_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, source, bounds: List[Tuple[float, float]], first: int, slots: TranscriptSlots,
+              stop_flag: threading.Event, on_draft: Optional[Callable[[float, float, Content], None]] = None) -> None:
+        """Draft chunks `first`.. of `bounds`; `on_draft(start_s, end_s, content)` records new drafts."""
+        self._thread = threading.Thread(
+            target=self._run, args=(source, bounds, first, slots, stop_flag, on_draft),
+            name="VoiceTransor-draft", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, source, bounds: List[Tuple[float, float]], first: int, slots: TranscriptSlots,
+             stop_flag: threading.Event, on_draft: Optional[Callable[[float, float, Content], None]]) -> None:
+        from app.core.stt.chunked_transcriber import _absolute_segments
+
+        sr = source.sample_rate
+        drafted = 0
+        for i in range(first, len(bounds)):
+            if self._stop.is_set() or stop_flag.is_set():
+                return
+            if not slots.pending(i):
+                continue
+            start_s, end_s = bounds[i]
+            key = _chunk_key(start_s, end_s)
+            with self._results_lock:
+                content = self._results.get(key)
+            if content is None:
+                samples = source.read(int(start_s * sr), int(end_s * sr))
+                smap = None
+                if self._c_cfg.prune_silence_s > 0:
+                    samples, smap = prune_non_speech(
+                        samples, sr, self._c_cfg.prune_silence_s,
+                        self._c_cfg.silence_thresh_dbfs, self._c_cfg.prune_pad_ms,
+                    )
+                if samples.size == 0:
+                    res: Dict[str, Any] = {"text": "", "segments": []}
+                else:
+                    try:
+                        res = self.backend.transcribe(np.ascontiguousarray(samples), self._language)
+                    except Exception as e:
+                        log.warning(f"Draft pass stopped at {start_s:.1f}s: {e}")
+                        return
+                if self._timestamps:
+                    content = _absolute_segments(res.get("segments") or [], start_s, smap)
+                else:
+                    content = (res.get("text") or "").strip()
+                drafted += 1
+                with self._results_lock:
+                    self._results[key] = content
+                if on_draft is not None:
+                    on_draft(start_s, end_s, content)
+            slots.draft(i, content)
+        log.info(f"Draft pass finished ({drafted} chunks drafted with '{self.backend.model_name}')")
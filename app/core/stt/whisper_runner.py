@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 """Whisper transcription helpers (local, offline)."""
 from __future__ import annotations
+import functools
+import json
 import os
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
+
+import logging
+log = logging.getLogger(__name__)
 
 
 def default_models_dir() -> Path:
@@ -46,6 +52,297 @@ def pick_device(choice: str) -> str:
     return "cpu"
 
 
+# -------------------------
+# Verified checkpoint registry
+# -------------------------
+# whisper.load_model(name) re-reads and SHA-256-hashes the whole .pt on every
+# load. Once a file has passed that check, its size + mtime are recorded here and
+# later loads of the unchanged file skip the hash.
+_VERIFIED_LOCK = threading.Lock()
+
+
+def _verified_registry_path() -> Path:
+    return default_models_dir().parent / "verified_checkpoints.json"
+
+
+def _read_verified() -> Dict[str, Any]:
+    try:
+        return json.loads(_verified_registry_path().read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def _checkpoint_verified(path: Path, sha256: str) -> bool:
+    """Whether `path` was verified against `sha256` and has not changed since."""
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    with _VERIFIED_LOCK:
+        rec = _read_verified().get(str(path.resolve()))
+    return bool(rec) and rec.get("sha256") == sha256 and rec.get("size") == st.st_size \
+        and rec.get("mtime_ns") == st.st_mtime_ns
+
+
+def _record_verified(path: Path, sha256: str) -> None:
+    try:
+        st = path.stat()
+        with _VERIFIED_LOCK:
+            data = _read_verified()
+            data[str(path.resolve())] = {"sha256": sha256, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            reg = _verified_registry_path()
+            reg.parent.mkdir(parents=True, exist_ok=True)
+            tmp = reg.with_name(reg.name + ".tmp")
+            tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            os.replace(tmp, reg)
+    except Exception as e:
+        log.debug(f"Failed to record verified checkpoint {path}: {e}")
+
+
+def load_whisper_model(name: str, device: str, models_dir: Path, mmap_weights: bool = True,
+                       quantize: bool = False):
+    """`whisper.load_model(name, device, download_root=models_dir)` without redundant work.
+
+    For an official model whose checkpoint is unchanged since it was last
+    verified, the file is loaded directly by path (whisper then skips the SHA-256
+    check) and the model's alignment heads are set as load_model would. Anything
+    else goes through whisper's normal verify/download path, and the verified
+    file is recorded for next time.
+
+    On CPU (`mmap_weights`), the verified checkpoint is also converted once into
+    an fp32 copy that later loads memory-map instead of deserializing; see
+    `_load_mmap_model`. With `quantize` (CPU only), the int8 variant from
+    `load_quantized_model` is returned instead.
+    """
+    import whisper  # type: ignore
+
+    if quantize:
+        if device == "cpu":
+            return load_quantized_model(name, models_dir)
+        log.info(f"int8 quantization is CPU-only; loading '{name}' unquantized on {device}")
+
+    url = getattr(whisper, "_MODELS", {}).get(name)
+    if url is None:
+        return whisper.load_model(name, device=device, download_root=str(models_dir))
+
+    sha256 = url.split("/")[-2]
+    use_mmap = mmap_weights and device == "cpu" and _mmap_supported()
+    if use_mmap:
+        model = _load_mmap_model(name, models_dir, sha256)
+        if model is not None:
+            return model
+
+    target = Path(models_dir) / os.path.basename(url)
+    if _checkpoint_verified(target, sha256):
+        log.debug(f"Checkpoint {target.name} unchanged since verification; skipping SHA-256")
+        model = whisper.load_model(str(target), device=device)
+        heads = getattr(whisper, "_ALIGNMENT_HEADS", {}).get(name)
+        if heads is not None:
+            model.set_alignment_heads(heads)
+    else:
+        model = whisper.load_model(name, device=device, download_root=str(models_dir))
+        # load_model only returns after the file on disk matched the hash
+        _record_verified(target, sha256)
+
+    if use_mmap and not _mmap_checkpoint_current(name, models_dir, sha256):
+        # only when missing or made from another checkpoint: a copy that exists but
+        # failed to load would fail again, and rewriting it costs a full fp32 save
+        _write_mmap_checkpoint(model, name, models_dir, sha256)
+    return model
+
+
+# -------------------------
+# Memory-mapped weights
+# -------------------------
+# Official checkpoints hold fp16 weights that load_model copies into a fp32
+# model, so every process owns a private copy. The fp32 state dict saved once
+# next to the checkpoint can instead be opened with torch.load(mmap=True): the
+# tensors are views of the file, loading is mostly page-table setup, and
+# processes on one host share the read-only pages through the page cache.
+#
+# Disk use: the fp32 copy is about twice the size of the official checkpoint
+# (~6 GB for large), and `<name>.int8.pt` (below) adds a quantized copy. Both
+# sit in models_dir, outside every cache budget, and are replaced in place
+# when the source checkpoint changes; deleting them is safe (they are rebuilt
+# on the next load that wants them).
+@functools.lru_cache(maxsize=None)
+def _mmap_supported() -> bool:
+    """Whether torch can memory-map a checkpoint and assign its tensors (torch >= 2.1)."""
+    try:
+        import inspect
+        import torch  # type: ignore
+        return "mmap" in inspect.signature(torch.load).parameters \
+            and "assign" in inspect.signature(torch.nn.Module.load_state_dict).parameters
+    except Exception:
+        return False
+
+
+def _mmap_checkpoint_path(name: str, models_dir: Path) -> Path:
+    return Path(models_dir) / f"{name}.fp32.mmap.pt"
+
+
+def _write_mmap_checkpoint(model, name: str, models_dir: Path, source_sha256: str) -> None:
+    from dataclasses import asdict
+    import torch  # type: ignore
+
+    path = _mmap_checkpoint_path(name, models_dir)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        payload = {
+            "dims": asdict(model.dims),
+            "source_sha256": source_sha256,
+            "model_state_dict": {k: v.detach().to("cpu", torch.float32) for k, v in model.state_dict().items()},
+        }
+        torch.save(payload, tmp)
+        os.replace(tmp, path)
+        log.debug(f"Wrote memory-mappable checkpoint {path.name}")
+    except Exception as e:
+        log.debug(f"Failed to write memory-mappable checkpoint {path}: {e}")
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _mmap_checkpoint_current(name: str, models_dir: Path, source_sha256: str) -> bool:
+    """Whether the fp32 copy exists and was made from the checkpoint with `source_sha256`."""
+    path = _mmap_checkpoint_path(name, models_dir)
+    if not path.is_file():
+        return False
+    try:
+        import torch  # type: ignore
+        # mapped, so reading the tag does not deserialize the weights
+        ck = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+        return ck.get("source_sha256") == source_sha256
+    except Exception:
+        return False  # unreadable: write it again
+
+
+def _load_mmap_model(name: str, models_dir: Path, source_sha256: str):
+    """Build the model on the meta device and assign memory-mapped weights (None if unavailable)."""
+    path = _mmap_checkpoint_path(name, models_dir)
+    if not path.is_file():
+        return None
+    try:
+        import numpy as np
+        import torch  # type: ignore
+        import whisper  # type: ignore
+        from whisper.model import ModelDimensions, Whisper  # type: ignore
+
+        ck = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+        if ck.get("source_sha256") != source_sha256:
+            return None
+        dims = ModelDimensions(**ck["dims"])
+        with torch.device("meta"):
+            model = Whisper(dims)
+        model.load_state_dict(ck["model_state_dict"], assign=True)
+
+        # non-persistent buffers are not in the state dict: rebuild them as Whisper.__init__ does
+        mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(-np.inf).triu_(1)
+        model.decoder.register_buffer("mask", mask, persistent=False)
+        all_heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+        all_heads[dims.n_text_layer // 2:] = True
+        model.register_buffer("alignment_heads", all_heads.to_sparse(), persistent=False)
+        heads = getattr(whisper, "_ALIGNMENT_HEADS", {}).get(name)
+        if heads is not None:
+            model.set_alignment_heads(heads)
+        log.debug(f"Loaded memory-mapped weights from {path.name}")
+        return model.eval()
+    except Exception as e:
+        # an unreadable file or an incompatible whisper: fall back to a normal load
+        log.debug(f"Memory-mapped load of {path} failed: {e}")
+        return None
+
+
+# -------------------------
+# Dynamic int8 quantization
+# -------------------------
+def quantize_model(model):
+    """Quantize the model's linear layers to int8 (dynamic activations), in place.
+
+    whisper uses its own `Linear` subclass, which `quantize_dynamic` does not
+    match, so those layers are swapped for plain `nn.Linear` (sharing weights)
+    first. The output projection against the token embedding is a plain matmul
+    and stays fp32. CPU only.
+    """
+    import torch  # type: ignore
+    from whisper.model import Linear as WhisperLinear  # type: ignore
+
+    for parent in list(model.modules()):
+        for child_name, child in list(parent.named_children()):
+            if isinstance(child, WhisperLinear):
+                lin = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+                lin.weight = child.weight
+                lin.bias = child.bias
+                setattr(parent, child_name, lin)
+    return torch.ao.quantization.quantize_dynamic(model.to("cpu").eval(), {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def _quantized_path(name: str, models_dir: Path) -> Path:
+    return Path(models_dir) / f"{name}.int8.pt"
+
+
+def _quantized_tag(name: str) -> Dict[str, Any]:
+    import torch  # type: ignore
+    import whisper  # type: ignore
+    url = getattr(whisper, "_MODELS", {}).get(name, name)
+    return {"source": url, "torch": torch.__version__, "whisper": getattr(whisper, "__version__", "")}
+
+
+def load_quantized_model(name: str, models_dir: Path):
+    """Return the int8 CPU model for `name`, quantizing (and caching it) only once.
+
+    The quantized module is pickled whole (its packed weights have no plain
+    state-dict form to rebuild from) into `<name>.int8.pt` next to the checkpoint;
+    it is reused while the source checkpoint and torch/whisper versions match
+    (see the disk-use note above `_mmap_supported`).
+    """
+    import torch  # type: ignore
+
+    path = _quantized_path(name, models_dir)
+    tag = _quantized_tag(name)
+    if path.is_file():
+        try:
+            # our own file, written below; weights_only cannot unpickle quantized modules
+            data = torch.load(path, map_location="cpu", weights_only=False)
+            if data.get("tag") == tag:
+                log.debug(f"Loaded cached int8 model {path.name}")
+                return data["model"]
+        except Exception as e:
+            log.debug(f"Cached int8 model {path} unusable: {e}")
+
+    log.info(f"Quantizing model '{name}' to int8 (one-time)")
+    model = quantize_model(load_whisper_model(name, "cpu", models_dir))
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        torch.save({"tag": tag, "model": model}, tmp)
+        os.replace(tmp, path)
+    except Exception as e:
+        log.debug(f"Failed to cache int8 model {path}: {e}")
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+    return model
+
+
+# -------------------------
+# Language detection
+# -------------------------
+def detect_language(model, samples, fp16: bool = False) -> Dict[str, float]:
+    """Language probabilities for the first 30 s of `samples` (one encoder pass + one decoder step)."""
+    import torch  # type: ignore
+    from whisper.audio import log_mel_spectrogram, pad_or_trim  # type: ignore
+
+    if not model.is_multilingual:
+        return {"en": 1.0}
+    mel = pad_or_trim(log_mel_spectrogram(samples, model.dims.n_mels))
+    mel = mel.to(model.device).to(torch.float16 if fp16 else torch.float32)
+    with torch.no_grad():
+        _, probs = model.detect_language(mel)
+    return dict(probs)
+
+
 def transcribe(
     audio_path: Path,
     model_name: str = "base",
@@ -83,7 +380,7 @@ def transcribe(
     fp16 = device in ("cuda", "mps")
 
     try:
-        model = whisper.load_model(model_name, device=device, download_root=str(models_dir))
+        model = load_whisper_model(model_name, device, models_dir)
     except Exception as e:
         raise RuntimeError(f"Failed to load/download model: {e}") from e
 
@@ -818,6 +818,18 @@ For support, feedback, or collaboration:
         <source>Run Text Operation</source>
         <translation>运行文本操作</translation>
     </message>
+    <message>
+        <source>Unload Models</source>
+        <translation>卸载模型</translation>
+    </message>
+    <message>
+        <source>Models unloaded.</source>
+        <translation>模型已卸载。</translation>
+    </message>
+    <message>
+        <source>Please wait for the running task to finish.</source>
+        <translation>请等待当前任务完成。</translation>
+    </message>
     <message>
         <location filename="../../ui/main_window.py" line="1782"/>
         <source>Export result as PDF…</source>
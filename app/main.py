@@ -4,9 +4,12 @@ from PySide6.QtWidgets import QApplication
 from app.ui.main_window import VoiceTransorMainWindow
 from app.i18n.manager import I18nManager
 from app._version import __version__
+from app.core.stt.engine import ENGINE
+from app.core.stt.parallel import shutdown_pool
 import sys
 
 import logging, os, sys
+import multiprocessing
 from pathlib import Path
 
 # ---- logging setup ----
@@ -72,6 +75,10 @@ def _setup_logging() -> None:
 
 
 def main() -> int:
+    # The inference engine and its workers are spawned processes; in a frozen build they re-run
+    # this executable, and freeze_support() routes them to the worker entry point
+    multiprocessing.freeze_support()
+
     # Must fix stdout BEFORE any logging or print statements
     _fix_stdout_for_frozen_app()
     _setup_logging()
@@ -89,7 +96,11 @@ def main() -> int:
 
     win = VoiceTransorMainWindow(version=__version__, i18n=i18n)
     win.show()
-    return app.exec()
+    try:
+        return app.exec()
+    finally:
+        ENGINE.close()
+        shutdown_pool()
 
 
 if __name__ == "__main__":
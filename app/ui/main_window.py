@@ -53,7 +53,7 @@ from app.core.audio.ffprobe_utils import (
     ffprobe_info, summarize_info, FFprobeError
 )
 from app.core.common.workers import TaskSpec, FunctionRunnable, WorkerSignals
-from app.core.stt.whisper_runner import transcribe, default_models_dir, is_model_cached, pick_device
+from app.core.stt.whisper_runner import transcribe, default_models_dir, pick_device
 # from app.core.summarize.openai_summarizer import summarize_with_openai
 from app.core.export.pdf_exporter import export_result_to_pdf
 from app.core.ai.openai_textops import run_text_op
@@ -61,7 +61,12 @@ from app.ui.options_dialogs import TranscribeOptionsDialog, OpenAISettingsDialog
 from app.i18n.manager import I18nManager
 
 from app.core.audio.chunker import ChunkConfig
-from app.core.stt.chunked_transcriber import transcribe_chunked, TranscribeOptions
+from app.core.stt.backends import BACKENDS, DEFAULT_BACKEND, available_backends
+from app.core.stt.cascade import CascadeConfig
+from app.core.stt.chunked_transcriber import MODEL_MANAGER, transcribe_chunked, TranscribeOptions
+from app.core.stt.engine import ENGINE
+from app.core.stt.parallel import shutdown_pool
+from app.core.stt.preload import preload_model
 from app.core.system.thermal import ThermalConfig
 import threading
 import time
@@ -227,6 +232,14 @@ class VoiceTransorMainWindow(QMainWindow):
         self._apply_saved_theme()
         QTimer.singleShot(0, lambda: self._apply_saved_theme())  # apply theme again to ensure the text color of QGroupBox
 
+        # Load + warm up the last-used model in the background so the first job starts at once
+        self._preload_task: Optional[FunctionRunnable] = None
+        QTimer.singleShot(1000, self._start_preload)
+
+        # Two-pass transcription: text of each chunk slot shown after `_chunk_slots_base`
+        self._chunk_slots: list[str] = []
+        self._chunk_slots_base = 0
+
 
 
     # -------------------------
@@ -257,6 +270,9 @@ class VoiceTransorMainWindow(QMainWindow):
         self.act_textops.setIcon(st.standardIcon(QStyle.SP_FileDialogInfoView))
         self.act_textops.triggered.connect(self.on_run_textops)
 
+        self.act_unload_models = QAction(self)
+        self.act_unload_models.triggered.connect(self.on_unload_models)
+
         self.act_export_pdf = QAction(self)
         self.act_export_pdf.setIcon(st.standardIcon(QStyle.SP_DialogSaveButton))
         self.act_export_pdf.triggered.connect(self.on_export_pdf)
@@ -381,6 +397,7 @@ class VoiceTransorMainWindow(QMainWindow):
         self.menu_tools.addAction(self.act_transcribe)
         self.menu_tools.addAction(self.act_textops)
         self.menu_tools.addSeparator()
+        self.menu_tools.addAction(self.act_unload_models)
         # OpenAI Settings menu item hidden from end users (code preserved for developer extensibility)
         # self.menu_tools.addAction(self.act_openai_settings)
 
@@ -1296,6 +1313,65 @@ class VoiceTransorMainWindow(QMainWindow):
     # def on_play_pause(self) -> None:
     #     QMessageBox.information(self, self.tr("Play/Pause"), self.tr("To be implemented."))
 
+    def _start_preload(self) -> None:
+        """Preload `stt/model` in the thread pool (no-op if disabled, busy or already running)."""
+        if str(self.settings.value("stt/preload", True)).lower() not in ("1", "true"):
+            return
+        if self._preload_task is not None or self._active_tasks:
+            return
+        backend = self._stt_backend()
+        if backend is None:
+            return
+
+        signals = WorkerSignals()
+        task = TaskSpec(
+            fn=ENGINE.preload if self._use_engine() else preload_model,
+            args=(str(self.opt_model), str(self.opt_device), Path(self.opt_models_dir)),
+            kwargs={
+                "workers": int(self.settings.value("stt/workers", 0)),
+                "quantize": str(self.settings.value("stt/quantize", False)).lower() in ("1", "true"),
+                "backend": backend,
+            },
+        )
+        runnable = FunctionRunnable(task, signals)
+
+        def on_result(msg):
+            self.statusBar().showMessage(str(msg), 5000)
+
+        def on_error(err):
+            log.warning(f"Model preload failed: {err}")
+
+        def on_finished():
+            self._preload_task = None
+
+        signals.result.connect(on_result)
+        signals.error.connect(on_error)
+        signals.finished.connect(on_finished)
+        self._preload_task = runnable
+        self.pool.start(runnable)
+
+    def _stt_backend(self) -> Optional[str]:
+        """The `stt/backend` setting, or None when that backend is unknown or not installed."""
+        backend = str(self.settings.value("stt/backend", DEFAULT_BACKEND)) or DEFAULT_BACKEND
+        if backend not in available_backends():
+            log.warning(f"Transcription backend '{backend}' is not available (installed: {available_backends()})")
+            return None
+        return backend
+
+    def _use_engine(self) -> bool:
+        """Run inference in the persistent engine process (default) instead of a GUI-process thread."""
+        return str(self.settings.value("stt/out_of_process", True)).lower() in ("1", "true")
+
+    def on_unload_models(self) -> None:
+        """Free all loaded models: restart the engine process (and drop in-process models/workers)."""
+        if self._active_tasks or self._preload_task is not None:
+            QMessageBox.information(self, self.tr("Busy"), self.tr("Please wait for the running task to finish."))
+            return
+        ENGINE.restart()
+        MODEL_MANAGER.close()
+        shutdown_pool()
+        self.statusBar().showMessage(self.tr("Models unloaded."), 5000)
+
     def on_transcribe(self) -> None:
         if not self.current_audio_path:
             QMessageBox.information(self, self.tr("Info"), self.tr("Please import an audio file first."))
@@ -1310,6 +1386,8 @@ class VoiceTransorMainWindow(QMainWindow):
             )
             return
 
+        # the last-used model is the likely pick: load it while the dialog is open
+        self._start_preload()
         dlg = TranscribeOptionsDialog(
             self,
             model=str(self.opt_model),
@@ -1328,8 +1406,18 @@ class VoiceTransorMainWindow(QMainWindow):
         self.settings.setValue("stt/device", device)
         self.settings.setValue("stt/models_dir", str(models_dir))
 
+        backend = self._stt_backend()
+        if backend is None:
+            QMessageBox.warning(
+                self, self.tr("Error"),
+                self.tr(f"Transcription backend '{self.settings.value('stt/backend')}' is not available.\n"
+                        f"Installed backends: {', '.join(available_backends()) or 'none'}"),
+            )
+            return
+        backend_cls = BACKENDS[backend]
+
         # First-time download notice
-        if not is_model_cached(model, models_dir):
+        if not backend_cls.is_model_cached(model, models_dir):
             ok = QMessageBox.question(
                 self, self.tr("Download Model"),
                 self.tr(f"Model '{model}' is not cached yet.\nDownload to:\n{models_dir}\n\nStart now?"),
@@ -1345,6 +1433,20 @@ class VoiceTransorMainWindow(QMainWindow):
             device=device,
             models_dir=models_dir,
             include_timestamps=bool(include_ts),
+            pcm_cache_mb=int(self.settings.value("cache/pcm_budget_mb", 4096)),
+            chunk_cache_mb=int(self.settings.value("cache/chunk_budget_mb", 256)),
+            workers=int(self.settings.value("stt/workers", 0)),
+            batch_size=int(self.settings.value("stt/batch_size", 1)),
+            model_cache_mb=int(self.settings.value("stt/model_cache_mb", 0)),
+            quantize=str(self.settings.value("stt/quantize", False)).lower() in ("1", "true"),
+            backend=backend_cls.name,
+            draft_model=str(self.settings.value("stt/draft_model", "")),
+            cascade=CascadeConfig(
+                model=str(self.settings.value("stt/cascade_model", "")),
+                logprob_threshold=float(self.settings.value("stt/cascade_logprob_threshold", -1.0)),
+                no_speech_threshold=float(self.settings.value("stt/cascade_no_speech_threshold", 0.6)),
+                compression_ratio_threshold=float(self.settings.value("stt/cascade_compression_ratio_threshold", 2.4)),
+            ),
         )
         c_cfg = ChunkConfig(
             target_s=float(self.settings.value("chunk/target_s", 30.0)),
@@ -1353,6 +1455,10 @@ class VoiceTransorMainWindow(QMainWindow):
             max_chunk_s=float(self.settings.value("chunk/max_chunk_s", 40.0)),
             min_silence_len_ms=int(self.settings.value("chunk/min_silence_len_ms", 300)),
             silence_thresh_dbfs=int(self.settings.value("chunk/silence_thresh_dbfs", -35)),
+            silence_detector=str(self.settings.value("chunk/silence_detector", "numpy")),
+            prune_silence_s=float(self.settings.value("chunk/prune_silence_s", 3.0)),
+            prune_pad_ms=int(self.settings.value("chunk/prune_pad_ms", 200)),
+            align_to_window=str(self.settings.value("chunk/align_to_window", False)).lower() in ("1", "true"),
         )
         th_cfg = ThermalConfig(
             enabled=bool(self.settings.value("thermal/enabled", True)),
@@ -1376,21 +1482,25 @@ class VoiceTransorMainWindow(QMainWindow):
         QCoreApplication.processEvents()
 
         # CRITICAL: Force GPU cleanup before starting new transcription
-        try:
-            import torch
-            import gc
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                torch.cuda.synchronize()
-                gc.collect()
-                log.debug("GPU memory cleared before new transcription")
-        except Exception as e:
-            log.debug(f"Failed to clear GPU memory: {e}")
+        # (only when inference shares this process; the engine process manages its own)
+        if not self._use_engine():
+            try:
+                import torch
+                import gc
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+                    torch.cuda.synchronize()
+                    gc.collect()
+                    log.debug("GPU memory cleared before new transcription")
+            except Exception as e:
+                log.debug(f"Failed to clear GPU memory: {e}")
 
         # AGGRESSIVE RESET: Clear text box completely
         try:
             self.txt_transcript.clear()
             self.txt_transcript.setPlainText("")
+            self._chunk_slots = []
+            self._chunk_slots_base = 0
             log.debug("Text box cleared for new transcription")
         except Exception as e:
             log.debug(f"Failed to clear text box: {e}")
@@ -1398,7 +1508,7 @@ class VoiceTransorMainWindow(QMainWindow):
         QCoreApplication.processEvents()  # Process clear events
 
         signals = self._run_task(
-            transcribe_chunked,
+            ENGINE.transcribe if self._use_engine() else transcribe_chunked,
             audio_path=self.current_audio_path,
             t_opt=t_opt,
             c_cfg=c_cfg,
@@ -1411,6 +1521,7 @@ class VoiceTransorMainWindow(QMainWindow):
         # Connect signals immediately after _run_task but before task actually runs
         signals.partial_text.connect(self._on_partial_transcript)
         signals.bootstrap_text.connect(self._on_bootstrap_transcript)
+        signals.chunk_text.connect(self._on_chunk_transcript)
 
         def on_res(text: str):
             # log.debug("on_res() of transcribe, got text:")
@@ -1440,6 +1551,8 @@ class VoiceTransorMainWindow(QMainWindow):
             log.debug("got previously trans text")
             log.debug(text)
             self.txt_transcript.setPlainText(text)
+            self._chunk_slots = []
+            self._chunk_slots_base = self.txt_transcript.document().characterCount() - 1
             # to end, cause error
             # self.txt_transcript.moveCursor(self.txt_transcript.textCursor().End)
         except Exception as e:
@@ -1461,6 +1574,27 @@ class VoiceTransorMainWindow(QMainWindow):
         except Exception as e:
             log.error(f"Failed to append transcript text: {e}")
 
+    def _on_chunk_transcript(self, slot: int, text: str) -> None:
+        """Two-pass mode: show a chunk's draft, or replace it with the refined text."""
+        try:
+            from PySide6.QtGui import QTextCursor
+
+            def qlen(s: str) -> int:
+                # document positions count UTF-16 code units
+                return len(s.encode("utf-16-le")) // 2 + 1 if s else 0
+
+            slots = self._chunk_slots
+            while len(slots) <= slot:
+                slots.append("")
+            start = self._chunk_slots_base + sum(qlen(s) for s in slots[:slot])
+            cursor = self.txt_transcript.textCursor()
+            cursor.setPosition(start)
+            cursor.setPosition(start + qlen(slots[slot]), QTextCursor.KeepAnchor)
+            cursor.insertText(text + "\n" if text else "")
+            slots[slot] = text
+        except Exception as e:
+            log.error(f"Failed to update transcript text: {e}")
+
     def on_cancel_transcription(self) -> None:
         if self._stop_flag is not None:
             self._stop_flag.set()
@@ -1792,6 +1926,7 @@ class VoiceTransorMainWindow(QMainWindow):
 
         self.act_save_txt.setText(self.tr("Save Transcript as TXT…"))
         self.act_textops.setText(self.tr("Run Text Operation"))
+        self.act_unload_models.setText(self.tr("Unload Models"))
         self.act_export_pdf.setText(self.tr("Export result as PDF…"))
         self.act_save_result_as_txt.setText(self.tr("Save Result as TXT…"))
         # self.act_openai_settings.setText(self.tr("OpenAI Settings…"))  # Hidden from end users
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Throughput of batched Whisper inference against batch size, per model.
+
+Cuts the input recording into 30 s chunks and transcribes the same chunks with
+batch sizes 1, 2, 4, ... (batch size 1 is the per-chunk `model.transcribe`
+path of the app). Reports audio seconds transcribed per wall second, and the
+encoder alone, whose matmuls are what batching speeds up on CPU.
+
+Run from the repository root:
+    python -m cli.bench_batched -i lecture.mp3 --models tiny base small --chunks 16
+"""
+import argparse
+import time
+
+import torch
+import whisper
+
+from app.core.audio.pcm import SAMPLE_RATE, decode_audio
+from app.core.stt.batched import _mel_window, transcribe_batch
+from app.core.stt.whisper_runner import default_models_dir
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batched Whisper inference benchmark")
+    ap.add_argument("-i", "--input", required=True, help="Speech recording to cut into 30 s chunks")
+    ap.add_argument("--models", nargs="+", default=["tiny", "base", "small"])
+    ap.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 2, 4, 8])
+    ap.add_argument("--chunks", type=int, default=16, help="Chunks per measurement (default: 16)")
+    ap.add_argument("-l", "--lang", default=None, help="Language code (default: auto-detect)")
+    ap.add_argument("--threads", type=int, default=0, help="torch threads (default: torch's choice)")
+    ap.add_argument("--models-dir", default=str(default_models_dir()))
+    args = ap.parse_args()
+
+    if args.threads > 0:
+        torch.set_num_threads(args.threads)
+
+    audio = decode_audio(args.input)
+    step = 30 * SAMPLE_RATE
+    chunks = [audio.samples[i:i + step] for i in range(0, audio.num_samples - step + 1, step)][:args.chunks]
+    if not chunks:
+        raise SystemExit("Input is shorter than one 30 s chunk")
+    audio_s = len(chunks) * 30.0
+    print(f"{len(chunks)} chunks ({audio_s:.0f}s of audio), torch threads: {torch.get_num_threads()}")
+
+    for name in args.models:
+        model = whisper.load_model(name, device="cpu", download_root=args.models_dir)
+        # warm-up (first call pays for lazy init)
+        transcribe_batch(model, chunks[:1], args.lang, fp16=False)
+        print(f"\n{name}:  batch   total s   audio s/s   encoder s/s")
+        base_rate = None
+        for bs in args.batch_sizes:
+            t = time.perf_counter()
+            if bs == 1:
+                for c in chunks:
+                    model.transcribe(c, language=args.lang, task="transcribe", fp16=False, verbose=False)
+            else:
+                for i in range(0, len(chunks), bs):
+                    transcribe_batch(model, chunks[i:i + bs], args.lang, fp16=False)
+            total = time.perf_counter() - t
+
+            t = time.perf_counter()
+            with torch.no_grad():
+                for i in range(0, len(chunks), bs):
+                    mel = torch.stack([_mel_window(model, c) for c in chunks[i:i + bs]])
+                    model.embed_audio(mel)
+            enc = time.perf_counter() - t
+
+            rate = audio_s / total
+            base_rate = base_rate or rate
+            print(f"{'':8}{bs:5d}  {total:8.1f}  {rate:10.1f}  {audio_s / enc:12.1f}   "
+                  f"({rate / base_rate:.2f}x)")
+        del model
+
+
+if __name__ == "__main__":
+    main()
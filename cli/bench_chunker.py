@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Check and time indexed silence lookup against the original linear scan.
+
+Builds randomized silence maps (sorted, non-overlapping regions), computes chunk
+boundaries with the SilenceIndex-based chunker and with the previous
+scan-every-region implementation, and fails if any boundary differs.
+
+Run from the repository root:
+    python -m cli.bench_chunker --trials 200
+"""
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from app.core.audio.chunker import ChunkConfig, SilenceIndex, boundaries_from_silences
+
+
+def _nearest_scan(ms: int, window_start: int, window_end: int,
+                  silences: List[Tuple[int, int]]) -> Optional[int]:
+    """Reference: the pre-index implementation (O(regions) per cut)."""
+    candidates: List[int] = []
+    for s, e in silences:
+        a = max(s, window_start)
+        b = min(e, window_end)
+        if a >= b:
+            continue
+        candidates.append((a + b) // 2)
+    if not candidates:
+        return None
+    return min(candidates, key=lambda x: abs(x - ms))
+
+
+def boundaries_scan(total_ms: int, cfg: ChunkConfig, silences: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Reference: the pre-index compute_boundaries loop."""
+    bounds = []
+    pos = 0
+    while pos < total_ms:
+        target = pos + int(cfg.target_s * 1000)
+        min_ms = int(cfg.min_chunk_s * 1000)
+        max_ms = int(cfg.max_chunk_s * 1000)
+        win_ms = int(cfg.search_window_s * 1000)
+        win_start = max(pos + min_ms, target - win_ms)
+        win_end = min(total_ms, min(pos + max_ms, target + win_ms))
+        if win_end <= win_start:
+            win_end = min(total_ms, win_start + 1)
+        cut_ms = _nearest_scan(target, win_start, win_end, silences)
+        if cut_ms is None:
+            cut_ms = min(pos + max_ms, total_ms)
+        end_ms = max(cut_ms, pos + 1)
+        bounds.append((pos, end_ms))
+        pos = end_ms
+    return bounds
+
+
+def random_silences(rng: random.Random, total_ms: int, mean_gap_ms: int) -> List[Tuple[int, int]]:
+    out = []
+    pos = rng.randint(0, mean_gap_ms)
+    while pos < total_ms:
+        length = rng.randint(1, 2000)
+        end = min(total_ms, pos + length)
+        if end > pos:
+            out.append((pos, end))
+        pos = end + 1 + int(rng.expovariate(1.0 / mean_gap_ms))
+    return out
+
+
+def random_config(rng: random.Random) -> ChunkConfig:
+    target = rng.uniform(5, 60)
+    return ChunkConfig(
+        target_s=target,
+        search_window_s=rng.uniform(0.5, 10),
+        min_chunk_s=rng.uniform(0, target),
+        max_chunk_s=target + rng.uniform(0, 20),
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Silence index regression check and benchmark")
+    ap.add_argument("--trials", type=int, default=200, help="Randomized maps to compare (default: 200)")
+    ap.add_argument("--hours", type=float, default=3.0, help="Length of the timing run (default: 3)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    for t in range(args.trials):
+        total_ms = rng.randint(1, 2 * 3600 * 1000)
+        silences = random_silences(rng, total_ms, rng.choice([200, 1000, 5000, 60000]))
+        cfg = random_config(rng)
+        old = boundaries_scan(total_ms, cfg, silences)
+        new = boundaries_from_silences(total_ms, cfg, SilenceIndex(silences))
+        if old != new:
+            print(f"MISMATCH in trial {t}: total_ms={total_ms} cfg={cfg}", file=sys.stderr)
+            sys.exit(1)
+    print(f"{args.trials} randomized silence maps: boundaries identical")
+
+    # Timing: noisy lecture, a short pause roughly every 400 ms
+    total_ms = int(args.hours * 3600 * 1000)
+    silences = random_silences(random.Random(args.seed), total_ms, 400)
+    cfg = ChunkConfig()
+    t = time.perf_counter()
+    old = boundaries_scan(total_ms, cfg, silences)
+    t_old = time.perf_counter() - t
+    t = time.perf_counter()
+    new = boundaries_from_silences(total_ms, cfg, SilenceIndex(silences))
+    t_new = time.perf_counter() - t
+    assert old == new
+    print(f"{len(silences)} silences, {len(new)} chunks: scan {t_old:.2f}s, index {t_new:.4f}s "
+          f"({t_old / max(t_new, 1e-9):.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Memory of N worker processes holding the same model: regular vs memory-mapped load.
+
+Starts N processes that each load the model the way transcription workers do,
+then reports load time and memory while all of them hold it. RSS counts shared
+pages in every process; USS (private) and PSS (shared pages split across
+sharers) show what the host actually pays. With memory-mapped weights the
+per-process USS should stay near the interpreter/torch baseline.
+
+Run from the repository root (the first mmap run converts the checkpoint):
+    python -m cli.bench_model_rss -m small --workers 1 4
+"""
+import argparse
+import multiprocessing as mp
+import time
+from pathlib import Path
+
+import psutil
+
+from app.core.stt.whisper_runner import default_models_dir, load_whisper_model
+
+
+def _hold_model(name: str, models_dir: str, mmap_weights: bool, ready, done) -> None:
+    import torch
+    torch.set_num_threads(1)
+    t = time.perf_counter()
+    model = load_whisper_model(name, "cpu", Path(models_dir), mmap_weights=mmap_weights)
+    ready.put(time.perf_counter() - t)
+    done.wait()
+    del model
+
+
+def measure(name: str, models_dir: str, workers: int, mmap_weights: bool) -> None:
+    ctx = mp.get_context("spawn")
+    ready, done = ctx.Queue(), ctx.Event()
+    procs = [ctx.Process(target=_hold_model, args=(name, models_dir, mmap_weights, ready, done))
+             for _ in range(workers)]
+    for p in procs:
+        p.start()
+    load_times = [ready.get() for _ in procs]
+
+    rss = uss = pss = 0
+    for p in procs:
+        info = psutil.Process(p.pid).memory_full_info()
+        rss += info.rss
+        uss += info.uss
+        pss += getattr(info, "pss", 0)
+    done.set()
+    for p in procs:
+        p.join()
+
+    mb = 1024 ** 2
+    mode = "mmap" if mmap_weights else "regular"
+    print(f"{mode:8} workers={workers}  load {sum(load_times) / len(load_times):6.2f}s avg   "
+          f"RSS {rss / mb:8.0f} MB   USS {uss / mb:8.0f} MB   PSS {pss / mb:8.0f} MB")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Model RSS with 1..N worker processes")
+    ap.add_argument("-m", "--model", default="small")
+    ap.add_argument("--workers", nargs="+", type=int, default=[1, 4])
+    ap.add_argument("--models-dir", default=str(default_models_dir()))
+    args = ap.parse_args()
+
+    # make sure the checkpoint is verified and converted before timing anything
+    load_whisper_model(args.model, "cpu", Path(args.models_dir), mmap_weights=True)
+    for n in args.workers:
+        for mmap_weights in (False, True):
+            measure(args.model, args.models_dir, n, mmap_weights)
+
+
+if __name__ == "__main__":
+    main()
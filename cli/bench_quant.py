@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Speed and accuracy of int8 dynamic quantization versus fp32 on CPU.
+
+Transcribes every audio file in a fixtures directory with the fp32 and the
+int8 model and reports the real-time factor (compute seconds per audio second)
+and the word error rate of each. A fixture `talk.wav` is scored against
+`talk.txt` next to it; without a reference text the fp32 transcript is the
+reference, so the int8 WER then measures drift from fp32.
+
+Run from the repository root:
+    python -m cli.bench_quant --models base small --fixtures data/samples
+"""
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import torch
+
+from app.core.audio.pcm import decode_audio
+from app.core.stt.whisper_runner import default_models_dir, load_whisper_model
+
+_AUDIO_EXT = {".wav", ".mp3", ".m4a", ".flac", ".ogg", ".opus"}
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"\w+(?:'\w+)?", text.lower())
+
+
+def wer(ref: str, hyp: str) -> float:
+    """Word error rate: word-level edit distance over the reference length."""
+    r, h = _words(ref), _words(hyp)
+    if not r:
+        return 0.0 if not h else 1.0
+    prev = list(range(len(h) + 1))
+    for i, rw in enumerate(r, 1):
+        cur = [i] + [0] * len(h)
+        for j, hw in enumerate(h, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (rw != hw))
+        prev = cur
+    return prev[-1] / len(r)
+
+
+def _transcribe(model, samples, language: Optional[str]) -> Tuple[str, float]:
+    t = time.perf_counter()
+    res = model.transcribe(samples, language=language, task="transcribe", fp16=False, verbose=False)
+    return res.get("text", "").strip(), time.perf_counter() - t
+
+
+def main():
+    ap = argparse.ArgumentParser(description="int8 vs fp32 CPU transcription benchmark")
+    ap.add_argument("--models", nargs="+", default=["base", "small"])
+    ap.add_argument("--fixtures", default="data/samples", help="Directory of audio files (+ optional .txt references)")
+    ap.add_argument("-l", "--lang", default=None, help="Language code (default: auto-detect)")
+    ap.add_argument("--threads", type=int, default=0, help="torch threads (default: torch's choice)")
+    ap.add_argument("--models-dir", default=str(default_models_dir()))
+    args = ap.parse_args()
+
+    if args.threads > 0:
+        torch.set_num_threads(args.threads)
+
+    files = sorted(p for p in Path(args.fixtures).iterdir() if p.suffix.lower() in _AUDIO_EXT)
+    if not files:
+        ap.error(f"no audio fixtures in {args.fixtures}")
+    fixtures = []
+    for p in files:
+        audio = decode_audio(p)
+        ref = p.with_suffix(".txt")
+        fixtures.append((p.name, audio.samples, audio.duration_s,
+                         ref.read_text(encoding="utf-8") if ref.is_file() else None))
+    total_s = sum(f[2] for f in fixtures)
+    print(f"{len(fixtures)} fixtures, {total_s:.0f} s of audio, {torch.get_num_threads()} threads")
+
+    for name in args.models:
+        models_dir = Path(args.models_dir)
+        fp32_texts = {}
+        for quantize in (False, True):
+            model = load_whisper_model(name, "cpu", models_dir, quantize=quantize)
+            _transcribe(model, fixtures[0][1][:16000 * 5], args.lang)  # warm-up
+            secs, errs = 0.0, []
+            for fname, samples, _, ref in fixtures:
+                text, elapsed = _transcribe(model, samples, args.lang)
+                secs += elapsed
+                if not quantize:
+                    fp32_texts[fname] = text
+                errs.append(wer(ref if ref is not None else fp32_texts[fname], text))
+            mode = "int8" if quantize else "fp32"
+            print(f"{name:10} {mode}  RTF {secs / total_s:6.3f}   WER {100 * sum(errs) / len(errs):5.1f}%")
+            del model
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Benchmark NumPy vs pydub silence detection on synthetic long-form audio.
+
+Run from the repository root:
+    python -m cli.bench_silence --minutes 60
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+from pydub.silence import detect_silence
+
+from app.core.audio.pcm import SAMPLE_RATE, samples_to_segment
+from app.core.audio.silence import detect_silence_np
+
+
+def synth_speechlike(minutes: float, seed: int = 0) -> np.ndarray:
+    """Alternate loud noise bursts (0.3–8 s) with quiet gaps (50 ms–1.5 s), 16-bit quantized."""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    parts = []
+    n = 0
+    while n < total:
+        talk = int(SAMPLE_RATE * rng.uniform(0.3, 8.0))
+        gap = int(SAMPLE_RATE * rng.uniform(0.05, 1.5))
+        parts.append(rng.standard_normal(talk).astype(np.float32) * 0.2)
+        parts.append(rng.standard_normal(gap).astype(np.float32) * 0.002)
+        n += talk + gap
+    x = np.concatenate(parts)[:total]
+    return (np.clip(np.round(x * 32768.0), -32768, 32767) / 32768.0).astype(np.float32)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Silence detection benchmark (NumPy vs pydub)")
+    ap.add_argument("--minutes", type=float, default=60.0, help="Synthetic audio length (default: 60)")
+    ap.add_argument("--min-silence-ms", type=int, default=300, help="Minimum silence length (default: 300)")
+    ap.add_argument("--thresh-dbfs", type=int, default=-35, help="Silence threshold in dBFS (default: -35)")
+    ap.add_argument("--skip-pydub", action="store_true", help="Only time the NumPy detector")
+    args = ap.parse_args()
+
+    print(f"Generating {args.minutes:.0f} min of synthetic audio...")
+    x = synth_speechlike(args.minutes)
+
+    t = time.perf_counter()
+    fast = detect_silence_np(x, SAMPLE_RATE, args.min_silence_ms, args.thresh_dbfs)
+    t_np = time.perf_counter() - t
+    print(f"numpy : {t_np:8.2f}s  ({len(fast)} regions)")
+
+    if args.skip_pydub:
+        return
+
+    seg = samples_to_segment(x)
+    t = time.perf_counter()
+    ref = detect_silence(seg, min_silence_len=args.min_silence_ms, silence_thresh=args.thresh_dbfs)
+    t_pd = time.perf_counter() - t
+    print(f"pydub : {t_pd:8.2f}s  ({len(ref)} regions)")
+    print(f"speedup: {t_pd / max(t_np, 1e-9):.1f}x")
+
+    if fast != ref:
+        print("MISMATCH: NumPy regions differ from pydub", file=sys.stderr)
+        sys.exit(1)
+    print("regions identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Resuming a checkpoint journal: drafts survive only under the format they were recorded in."""
+from app.core.stt.checkpoint import CheckpointJournal, load_journal
+
+
+def _header(with_timestamps: bool) -> dict:
+    return {"model": "small", "draft_model": "tiny", "with_timestamps": with_timestamps}
+
+
+def _first_run(path):
+    journal = CheckpointJournal(path)
+    journal.start(_header(True))
+    journal.chunk(0.0, 30.0, 90.0, "first", [{"start": 0.0, "end": 30.0, "text": "first"}])
+    journal.draft(30.0, 60.0, [{"start": 30.0, "end": 60.0, "text": "draft"}])
+    journal.close()
+
+
+def _resume(path, with_timestamps: bool):
+    ck = load_journal(path)
+    journal = CheckpointJournal(path)
+    journal.start(_header(with_timestamps), ck)
+    journal.close()
+    return load_journal(path)
+
+
+def test_resume_same_format_keeps_drafts(tmp_path):
+    path = tmp_path / "job.jsonl"
+    _first_run(path)
+    ck = _resume(path, with_timestamps=True)
+    assert ck["drafts"] == [{"start": 30.0, "end": 60.0,
+                             "content": [{"start": 30.0, "end": 60.0, "text": "draft"}]}]
+
+
+def test_resume_with_timestamps_toggled_drops_drafts(tmp_path):
+    path = tmp_path / "job.jsonl"
+    _first_run(path)
+    ck = _resume(path, with_timestamps=False)
+    assert ck["with_timestamps"] is False
+    assert ck["drafts"] == []
+    assert ck["text_parts"] == ["first"]
+    assert ck["done_until_s"] == 30.0
+    # and they stay gone on the next resume
+    assert _resume(path, with_timestamps=False)["drafts"] == []